@@ -4,27 +4,203 @@ from pathlib import Path
 
 from jinja2 import Template
 
+from ai_migration_accelerator.connectors.postgres.introspection import pgvector_capabilities
 from ai_migration_accelerator.models.state import WorkflowState
 
 
+def _primary_keys(state: WorkflowState) -> dict[str, list[str]]:
+    primary_keys: dict[str, list[str]] = {}
+    for table in state.raw_metadata.get("tables", []):
+        if not isinstance(table, dict):
+            continue
+        table_name = str(table.get("name", "")).strip()
+        columns = table.get("primary_key", [])
+        if table_name and isinstance(columns, list) and columns:
+            primary_keys[table_name] = [str(column) for column in columns]
+    return primary_keys
+
+
+def _table_columns(state: WorkflowState) -> dict[str, list[str]]:
+    table_columns: dict[str, list[str]] = {}
+    for column in state.mapping_plan.get("columns", []):
+        table_name = str(column.get("table", "")).strip()
+        column_name = str(column.get("column", "")).strip()
+        if table_name and column_name:
+            table_columns.setdefault(table_name, []).append(column_name)
+    return table_columns
+
+
+def _is_text_type(source_type: str) -> bool:
+    lowered = source_type.lower()
+    return any(marker in lowered for marker in ("char", "text", "clob", "string"))
+
+
+def _is_integer_value(value: str) -> bool:
+    return value.lstrip("-").isdigit()
+
+
+def _filter_predicates(state: WorkflowState) -> list[dict[str, object]]:
+    column_types = {
+        (str(column.get("table", "")).lower(), str(column.get("column", "")).lower()): str(
+            column.get("source_type", "")
+        )
+        for column in state.mapping_plan.get("columns", [])
+    }
+
+    predicates: list[dict[str, object]] = []
+    for index, item in enumerate(state.mapping_plan.get("business_filters", [])):
+        if not isinstance(item, dict):
+            continue
+        table_name = str(item.get("table", "")).strip()
+        column_name = str(item.get("column", "")).strip()
+        operator = str(item.get("operator", "==")).strip()
+        value = str(item.get("value", "")).strip()
+        source_type = column_types.get((table_name.lower(), column_name.lower()))
+        if not table_name or not column_name or not value or source_type is None:
+            continue
+
+        # Mirror the generated pandas semantics: case-insensitive text comparison, with
+        # NULLs treated as empty strings (so they pass "!=" and fail "==").
+        if _is_text_type(source_type):
+            value_type = "text"
+            bound_value: object = value.lower()
+        elif _is_integer_value(value):
+            value_type = "integer"
+            bound_value = int(value)
+        else:
+            continue
+
+        predicates.append(
+            {
+                "table": table_name,
+                "column": column_name,
+                "filter_index": index,
+                "operator": operator,
+                "value_type": value_type,
+                "param": f"filter_{index}",
+                "value": bound_value,
+            }
+        )
+    return predicates
+
+
+def _column_projection(
+    state: WorkflowState,
+    table_columns: dict[str, list[str]],
+    primary_keys: dict[str, list[str]],
+) -> dict[str, list[str]]:
+    embedding_columns = {
+        str(column).lower() for column in state.mapping_plan.get("selected_embedding_columns", [])
+    }
+    selected_column = str(state.mapping_plan.get("selected_embedding_column", {}).get("column", ""))
+    if selected_column:
+        embedding_columns.add(selected_column.lower())
+    if not embedding_columns:
+        # Without a planned embedding column the script falls back to keyword matching over
+        # every available column, so nothing may be pruned.
+        return {}
+
+    required: dict[str, set[str]] = {}
+
+    def _require(table_name: object, columns: object) -> None:
+        if not isinstance(columns, list):
+            return
+        bucket = required.setdefault(str(table_name).lower(), set())
+        bucket.update(str(column).lower() for column in columns)
+
+    join_edges = [
+        *state.mapping_plan.get("join_logic", []),
+        *state.mapping_plan.get("llm_join_plan", []),
+    ]
+    for edge in join_edges:
+        if not isinstance(edge, dict) or not isinstance(edge.get("on"), dict):
+            continue
+        _require(edge.get("from"), edge["on"].get("from_columns", []))
+        _require(edge.get("to"), edge["on"].get("to_columns", []))
+
+    for item in state.mapping_plan.get("business_filters", []):
+        if isinstance(item, dict):
+            _require(item.get("table"), [item.get("column", "")])
+
+    for table_name, columns in primary_keys.items():
+        _require(table_name, columns)
+
+    watermark_columns = state.mapping_plan.get("watermark_columns", {})
+    for table_name, watermark in watermark_columns.items():
+        if isinstance(watermark, dict) and watermark.get("kind") == "timestamp":
+            _require(table_name, [watermark.get("column", "")])
+
+    projection: dict[str, list[str]] = {}
+    for table_name, columns in table_columns.items():
+        table_required = required.get(table_name.lower(), set())
+        selected = [
+            column
+            for column in columns
+            if column.lower() in table_required
+            or column.lower() in embedding_columns
+            or column.lower() == "id"
+        ]
+        if selected and len(selected) < len(columns):
+            projection[table_name] = selected
+    return projection
+
+
+def _document_root(state: WorkflowState) -> str:
+    # Join edges point from the table holding the foreign key to the table it references,
+    # so every "to" table is the parent side of a one-to-many relationship.
+    child_counts: dict[str, int] = {}
+    parents: dict[str, list[str]] = {}
+    for edge in state.mapping_plan.get("join_logic", []):
+        if not isinstance(edge, dict):
+            continue
+        child = str(edge.get("from") or "").strip()
+        parent = str(edge.get("to") or "").strip()
+        if not child or not parent or child == parent:
+            continue
+        child_counts[parent] = child_counts.get(parent, 0) + 1
+        parents.setdefault(child, []).append(parent)
+    if not child_counts:
+        return ""
+
+    embedding_table = str(state.mapping_plan.get("selected_embedding_column", {}).get("table", "")).strip()
+    if embedding_table in child_counts:
+        return embedding_table
+    if embedding_table in parents:
+        # Rows of a leaf table (e.g. line items) belong to the entity they reference.
+        return max(parents[embedding_table], key=lambda table: child_counts[table])
+    return max(child_counts, key=lambda table: child_counts[table])
+
+
 def generate_code(state: WorkflowState) -> WorkflowState:
     template_path = Path(__file__).parents[1] / "generator" / "templates" / "migrate.py.j2"
     template = Template(template_path.read_text(encoding="utf-8"))
 
+    primary_keys = _primary_keys(state)
+    table_columns = _table_columns(state)
+    capabilities = pgvector_capabilities(state.context.target_connection)
+
     rendered_script = template.render(
         columns=state.mapping_plan.get("columns", []),
         entities=state.mapping_plan.get("business_entities", []),
         joins=state.mapping_plan.get("join_logic", []),
         llm_join_plan=state.mapping_plan.get("llm_join_plan", []),
         business_filters=state.mapping_plan.get("business_filters", []),
+        filter_predicates=_filter_predicates(state),
         embedding_candidates=state.mapping_plan.get("embedding_candidates", []),
         selected_embedding_column=state.mapping_plan.get("selected_embedding_column", {}),
         selected_embedding_columns=state.mapping_plan.get("selected_embedding_columns", []),
+        primary_keys=primary_keys,
+        table_columns=table_columns,
+        column_projection=_column_projection(state, table_columns, primary_keys),
+        watermark_columns=state.mapping_plan.get("watermark_columns", {}),
         source_connection=state.context.source_connection,
         target_connection=state.context.target_connection,
         embedding_model=state.context.embedding_model,
+        embedding_backend=state.context.embedding_backend,
         hf_token_env_var=state.context.hf_token_env_var,
         vector_table=state.context.vector_table,
+        vector_index=capabilities["recommended_index"],
+        document_root=_document_root(state),
     )
 
     state.generated_artifacts["migrate.py"] = rendered_script
@@ -34,9 +210,17 @@ def generate_code(state: WorkflowState) -> WorkflowState:
     output_path = output_dir / "migrate.py"
     output_path.write_text(rendered_script, encoding="utf-8")
 
+    target_summary = (
+        f"pgvector {capabilities.get('pgvector_version')} detected"
+        if capabilities.get("probed")
+        else "target not probed, using conservative defaults"
+    )
     state.generated_artifacts["pipeline_summary.md"] = (
         f"Generated migrate.py for {len(state.mapping_plan.get('columns', []))} columns "
-        f"across {len(state.mapping_plan.get('business_entities', []))} entities."
+        f"across {len(state.mapping_plan.get('business_entities', []))} entities. "
+        f"Vector index: {capabilities['recommended_index']}"
+        f"{', halfvec storage available via VECTOR_STORAGE' if capabilities.get('supports_halfvec') else ''} "
+        f"({target_summary})."
     )
 
     if state.context.enable_llm_advisor:
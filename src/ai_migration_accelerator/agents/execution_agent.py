@@ -8,8 +8,48 @@ import subprocess
 import tempfile
 from pathlib import Path
 
+from ai_migration_accelerator.core.settings import get_settings
 from ai_migration_accelerator.models.state import WorkflowState
 
+# Tunables forwarded into the migration container, read from AppSettings (environment and
+# .env). Fields left unset (VECTOR_STORAGE, VECTOR_INDEX, DOCUMENT_ROOT) are not forwarded, so
+# migrate.py keeps its rendered default or the existing table's column type.
+_MIGRATION_ENV_KEYS = (
+    "VECTOR_DIM",
+    "EMBEDDING_BACKEND",
+    "EMBEDDING_BATCH_SIZE",
+    "EMBEDDING_REDUCTION",
+    "EMBEDDING_PROJECTION_SAMPLE",
+    "EMBEDDING_CHUNKING",
+    "EMBEDDING_MAX_TOKENS",
+    "EMBEDDING_CHUNK_OVERLAP",
+    "EMBEDDING_PROCESSES",
+    "EMBEDDING_THREADS_PER_PROCESS",
+    "EMBEDDING_ONNX_QUANTIZATION",
+    "EMBEDDING_DRIFT_SAMPLE",
+    "EMBEDDING_MAX_DRIFT",
+    "EMBEDDING_CACHE_MAX_MB",
+    "STREAMING_EXTRACT",
+    "EXTRACT_CHUNK_SIZE",
+    "EXTRACT_WORKERS",
+    "SOURCE_JOIN_MODE",
+    "DOCUMENT_MODE",
+    "DOCUMENT_ROOT",
+    "LOAD_METHOD",
+    "LOAD_BATCH_SIZE",
+    "VECTOR_STORAGE",
+    "VECTOR_INDEX",
+    "VECTOR_INDEX_METRIC",
+    "INDEX_MAINTENANCE_WORK_MEM",
+    "INDEX_PARALLEL_WORKERS",
+    "RESUMABLE_LOAD",
+    "INCREMENTAL_LOAD",
+    "PIPELINE_MODE",
+    "PIPELINE_QUEUE_SIZE",
+    "EMBED_WORKERS",
+    "LOAD_WORKERS",
+)
+
 
 def _record_log(state: WorkflowState, line: str) -> None:
     state.execution_logs.append(line)
@@ -177,6 +217,43 @@ def _resolve_container_network(state: WorkflowState) -> str | None:
     return None
 
 
+def _migration_env_args() -> list[str]:
+    settings = get_settings()
+    env_args: list[str] = []
+    for key in _MIGRATION_ENV_KEYS:
+        value = getattr(settings, key.lower())
+        if value is None or value == "":
+            continue
+        if isinstance(value, bool):
+            value = "true" if value else "false"
+        env_args.extend(["-e", f"{key}={value}"])
+    return env_args
+
+
+def _resolve_hf_token(hf_token_env_key: str) -> str:
+    # HF_TOKEN may come from .env, which pydantic-settings reads but os.environ does not.
+    token = os.getenv(hf_token_env_key)
+    if token is None and hf_token_env_key == "HF_TOKEN":
+        token = get_settings().hf_token
+    return token or ""
+
+
+def _resolve_embedding_cache_dir(state: WorkflowState) -> str | None:
+    configured = (state.context.embedding_cache_dir or "").strip()
+    if not configured:
+        return None
+
+    cache_dir = Path(configured).expanduser().resolve()
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+    except OSError as exc:
+        state.open_questions.append(
+            f"Embedding cache directory '{cache_dir}' is not writable; running without cache: {exc}"
+        )
+        return None
+    return str(cache_dir)
+
+
 def _simulated_execution(state: WorkflowState) -> WorkflowState:
     row_count = 0
     for table in state.raw_metadata.get("tables", []):
@@ -202,6 +279,22 @@ def execute_migration(state: WorkflowState) -> WorkflowState:
         _finalize_logs_artifact(state)
         return state
 
+    join_estimates = state.mapping_plan.get("join_estimates", {})
+    if join_estimates.get("status") == "refused":
+        _record_log(
+            state,
+            f"Execution refused: projected join fan-out x{join_estimates.get('fan_out')} exceeds "
+            f"MAX_JOIN_FAN_OUT limit x{join_estimates.get('max_fan_out')}.",
+        )
+        state.execution_report = {
+            "mode": "refused",
+            "status": "failed",
+            "reason": "join_fan_out",
+            "join_estimates": join_estimates,
+        }
+        _finalize_logs_artifact(state)
+        return state
+
     runtime = state.context.container_runtime
     if shutil.which(runtime) is None:
         _record_log(state, f"Container runtime '{runtime}' not found; using simulated execution.")
@@ -215,6 +308,7 @@ def execute_migration(state: WorkflowState) -> WorkflowState:
     with tempfile.TemporaryDirectory(prefix="migration-run-") as temp_dir:
         temp_path = Path(temp_dir)
         report_path = temp_path / "migration_report.json"
+        projection_path = temp_path / "embedding_projection.json"
 
         required_files = ["migrate.py", "requirements.txt", "Dockerfile"]
         for file_name in required_files:
@@ -257,14 +351,28 @@ def execute_migration(state: WorkflowState) -> WorkflowState:
                 "-e",
                 "REPORT_PATH=/output/migration_report.json",
                 "-e",
-                f"{hf_token_env_key}={os.getenv(hf_token_env_key, '')}",
+                "EMBEDDING_PROJECTION_PATH=/output/embedding_projection.json",
+                "-e",
+                f"MIGRATION_RUN_ID={state.run_id}",
                 "-e",
-                "VECTOR_DIM=" + os.getenv("VECTOR_DIM", "384"),
+                f"{hf_token_env_key}={_resolve_hf_token(hf_token_env_key)}",
+                *_migration_env_args(),
                 "-v",
                 f"{mount_source}:/output",
-                image_tag,
             ]
         )
+        cache_dir = _resolve_embedding_cache_dir(state)
+        if cache_dir is not None:
+            run_command.extend(
+                [
+                    "-e",
+                    "EMBEDDING_CACHE_DIR=/cache",
+                    "-v",
+                    f"{cache_dir}:/cache",
+                ]
+            )
+            _record_log(state, f"Mounting embedding cache '{cache_dir}' at /cache.")
+        run_command.append(image_tag)
 
         try:
             _run_command(
@@ -285,6 +393,12 @@ def execute_migration(state: WorkflowState) -> WorkflowState:
             _finalize_logs_artifact(state)
             return state
 
+        if projection_path.exists():
+            state.generated_artifacts["embedding_projection.json"] = projection_path.read_text(
+                encoding="utf-8"
+            )
+            _record_log(state, "Saved fitted embedding projection as a run artifact.")
+
         if report_path.exists():
             report_data = json.loads(report_path.read_text(encoding="utf-8"))
             report_data["mode"] = "container"
@@ -11,7 +11,11 @@ def generate_infra(state: WorkflowState) -> WorkflowState:
             "oracledb>=2.2.0",
             "pandas>=2.2.0",
             "numpy>=1.26.0",
-            "sentence-transformers>=3.0.0",
+            (
+                "sentence-transformers>=3.0.0"
+                if state.context.embedding_backend == "torch"
+                else "sentence-transformers[onnx]>=3.2.0"
+            ),
         ]
     )
 
@@ -7,6 +7,7 @@ from datetime import date, datetime
 from decimal import Decimal
 from importlib import import_module
 
+from ai_migration_accelerator.control_plane.join_planner import fan_out_message, plan_joins
 from ai_migration_accelerator.core.settings import get_settings
 from ai_migration_accelerator.models.state import WorkflowState
 
@@ -150,7 +151,18 @@ def _apply_llm_suggestions(state: WorkflowState, suggestions: dict[str, object])
             )
 
     if llm_join_plan:
+        # The generated script prefers the LLM plan, so its estimate replaces the analyzer's.
+        llm_join_plan, join_estimates = plan_joins(
+            llm_join_plan,
+            state.schema_context.get("table_profiles", []),
+            max_fan_out=state.context.max_join_fan_out,
+            policy=state.context.join_fan_out_policy,
+        )
         state.mapping_plan["llm_join_plan"] = llm_join_plan
+        state.mapping_plan["join_estimates"] = join_estimates
+        fan_out_warning = fan_out_message(join_estimates)
+        if fan_out_warning:
+            state.open_questions.append(fan_out_warning)
 
     state.mapping_plan["llm_advice"] = {
         "model": state.context.llm_model,
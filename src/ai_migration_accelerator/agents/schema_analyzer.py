@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from typing import Any
 
+from ai_migration_accelerator.control_plane.join_planner import fan_out_message, plan_joins
 from ai_migration_accelerator.models.state import WorkflowState
 
 
@@ -117,6 +118,7 @@ def _infer_joins_from_conventions(
 def _embedding_candidates(table_profiles: list[dict[str, object]]) -> list[dict[str, str]]:
     keywords = {"note", "notes", "description", "comment", "summary", "text", "details"}
     candidates: list[dict[str, str]] = []
+    widths: list[int] = []
     for table in table_profiles:
         table_name = str(table.get("name", ""))
         columns_payload = table.get("columns", [])
@@ -129,7 +131,50 @@ def _embedding_candidates(table_profiles: list[dict[str, object]]) -> list[dict[
             lowered = column_name.lower()
             if any(keyword in lowered for keyword in keywords):
                 candidates.append({"table": table_name, "column": column_name})
-    return candidates
+                widths.append(column.get("avg_width") or 0)
+    # With catalog statistics, wider text columns carry more content to embed; the stable sort
+    # keeps keyword order when no widths are known.
+    order = sorted(range(len(candidates)), key=lambda index: -widths[index])
+    return [candidates[index] for index in order]
+
+
+def _watermark_columns(
+    table_profiles: list[dict[str, object]],
+    source_type: str,
+) -> dict[str, dict[str, str]]:
+    name_markers = ("updated", "modified", "changed", "last_update", "last_modified")
+    watermarks: dict[str, dict[str, str]] = {}
+
+    for table in table_profiles:
+        table_name = str(table.get("name", ""))
+        columns_payload = table.get("columns", [])
+        if not table_name or not isinstance(columns_payload, list):
+            continue
+
+        best: tuple[int, str] | None = None
+        for column in columns_payload:
+            if not isinstance(column, dict):
+                continue
+            column_name = str(column.get("name", ""))
+            lowered = column_name.lower()
+            column_type = str(column.get("type", "")).lower()
+            if not any(marker in lowered for marker in name_markers):
+                continue
+            if "timestamp" in column_type:
+                rank = 0
+            elif "date" in column_type or "time" in column_type:
+                rank = 1
+            else:
+                continue
+            if best is None or rank < best[0]:
+                best = (rank, column_name)
+
+        if best is not None:
+            watermarks[table_name] = {"column": best[1], "kind": "timestamp"}
+        elif source_type == "oracle":
+            watermarks[table_name] = {"column": "ORA_ROWSCN", "kind": "scn"}
+
+    return watermarks
 
 
 def _selected_embedding_columns(
@@ -208,6 +253,15 @@ def analyze_schema(state: WorkflowState) -> WorkflowState:
     ]
 
     join_logic = _infer_joins_from_conventions(table_profiles, join_logic)
+    join_logic, join_estimates = plan_joins(
+        join_logic,
+        table_profiles,
+        max_fan_out=state.context.max_join_fan_out,
+        policy=state.context.join_fan_out_policy,
+    )
+    fan_out_warning = fan_out_message(join_estimates)
+    if fan_out_warning:
+        state.open_questions.append(fan_out_warning)
     embedding_candidates = _embedding_candidates(table_profiles)
 
     if not embedding_candidates:
@@ -215,6 +269,8 @@ def analyze_schema(state: WorkflowState) -> WorkflowState:
             "No obvious text-like column found for embedding; using first text-compatible column fallback."
         )
 
+    watermark_columns = _watermark_columns(table_profiles, state.context.source_type)
+
     target_candidate = embedding_candidates[0] if embedding_candidates else {"table": "", "column": ""}
     selected_embedding_columns = _selected_embedding_columns(
         embedding_candidates,
@@ -225,9 +281,11 @@ def analyze_schema(state: WorkflowState) -> WorkflowState:
         "columns": mapped_columns,
         "business_entities": business_entities,
         "join_logic": join_logic,
+        "join_estimates": join_estimates,
         "embedding_candidates": embedding_candidates,
         "selected_embedding_column": target_candidate,
         "selected_embedding_columns": selected_embedding_columns,
+        "watermark_columns": watermark_columns,
         "workflow_summary": {
             "inferred_join_count": len(
                 [edge for edge in join_logic if bool(edge.get("inferred"))]
@@ -235,6 +293,9 @@ def analyze_schema(state: WorkflowState) -> WorkflowState:
             "join_count": len(join_logic),
             "embedding_candidate_count": len(embedding_candidates),
             "selected_embedding_column_count": len(selected_embedding_columns),
+            "watermark_table_count": len(
+                [item for item in watermark_columns.values() if item["kind"] == "timestamp"]
+            ),
         },
     }
     return state
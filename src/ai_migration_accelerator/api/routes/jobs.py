@@ -65,9 +65,15 @@ def _build_context(request: JobCreateRequest) -> RunContext:
             if request.sample_row_limit is not None
             else settings.sample_row_limit
         ),
+        sample_workers=settings.sample_workers,
+        sample_timeout_seconds=settings.sample_timeout_seconds,
         embedding_model=settings.embedding_model,
+        embedding_backend=settings.embedding_backend,
         hf_token_env_var=settings.hf_token_env_var,
+        embedding_cache_dir=settings.embedding_cache_dir,
         vector_table=settings.vector_table,
+        max_join_fan_out=settings.max_join_fan_out,
+        join_fan_out_policy=settings.join_fan_out_policy,
         run_containerized_migration=(
             request.run_containerized_migration
             if request.run_containerized_migration is not None
@@ -114,6 +114,8 @@ def collect_metadata(state: WorkflowState) -> WorkflowState:
         source_connection=state.context.source_connection,
         include_sample_rows=state.context.include_sample_rows,
         sample_row_limit=state.context.sample_row_limit,
+        sample_workers=state.context.sample_workers,
+        sample_timeout_seconds=state.context.sample_timeout_seconds,
     )
 
     ddl_tables = _parse_ddl_tables(state.context.ddl_text)
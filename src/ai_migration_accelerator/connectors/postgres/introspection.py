@@ -1,9 +1,101 @@
 from __future__ import annotations
 
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import SQLAlchemyError
 
-def pgvector_capabilities() -> dict[str, object]:
+_MEMORY_SETTINGS = (
+    "maintenance_work_mem",
+    "max_parallel_maintenance_workers",
+    "work_mem",
+    "shared_buffers",
+    "effective_cache_size",
+)
+_CAPABILITY_CACHE: dict[str, dict[str, object]] = {}
+
+
+def _parse_version(version: object) -> tuple[int, ...]:
+    parts: list[int] = []
+    for part in str(version or "").split("."):
+        digits = "".join(char for char in part if char.isdigit())
+        if not digits:
+            break
+        parts.append(int(digits))
+    return tuple(parts)
+
+
+def _static_capabilities() -> dict[str, object]:
     return {
+        "probed": False,
         "supports_vector": True,
+        "supports_hnsw": False,
+        "supports_halfvec": False,
+        "supports_sparsevec": False,
         "recommended_index": "ivfflat",
         "metadata_column": "jsonb",
     }
+
+
+def _capabilities_for(pgvector_version: str | None) -> dict[str, object]:
+    release = _parse_version(pgvector_version)
+    supports_hnsw = release >= (0, 5, 0)
+    # halfvec, sparsevec and bit indexing all shipped in pgvector 0.7.0.
+    supports_07 = release >= (0, 7, 0)
+    return {
+        "supports_vector": bool(release),
+        "supports_hnsw": supports_hnsw,
+        "supports_halfvec": supports_07,
+        "supports_sparsevec": supports_07,
+        "recommended_index": "hnsw" if supports_hnsw else "ivfflat",
+        "metadata_column": "jsonb",
+    }
+
+
+def _probe(target_connection: str) -> dict[str, object]:
+    engine = create_engine(target_connection, connect_args={"connect_timeout": 5})
+    try:
+        with engine.connect() as connection:
+            server_version = connection.execute(text("SHOW server_version")).scalar()
+            server_version_num = connection.execute(text("SHOW server_version_num")).scalar()
+            installed = connection.execute(
+                text("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+            ).scalar()
+            # The generated script runs CREATE EXTENSION, which installs the default version.
+            available = connection.execute(
+                text("SELECT default_version FROM pg_available_extensions WHERE name = 'vector'")
+            ).scalar()
+            settings = {
+                name: connection.execute(
+                    text("SELECT current_setting(:name, true)"), {"name": name}
+                ).scalar()
+                for name in _MEMORY_SETTINGS
+            }
+    finally:
+        engine.dispose()
+
+    pgvector_version = installed or available
+    return {
+        "probed": True,
+        "server_version": server_version,
+        "server_version_num": int(server_version_num or 0),
+        "pgvector_version": pgvector_version,
+        "pgvector_installed": installed is not None,
+        **_capabilities_for(pgvector_version),
+        "settings": settings,
+    }
+
+
+def pgvector_capabilities(target_connection: str | None = None) -> dict[str, object]:
+    if not target_connection:
+        return _static_capabilities()
+    cached = _CAPABILITY_CACHE.get(target_connection)
+    if cached is not None:
+        return dict(cached)
+
+    try:
+        capabilities = _probe(target_connection)
+    except (SQLAlchemyError, Exception) as exc:
+        # Unreachable targets are not cached, so the next run probes again.
+        return {**_static_capabilities(), "probe_error": str(exc)}
+
+    _CAPABILITY_CACHE[target_connection] = capabilities
+    return dict(capabilities)
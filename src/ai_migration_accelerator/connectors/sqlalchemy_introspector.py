@@ -1,7 +1,11 @@
 from __future__ import annotations
 
-from sqlalchemy import create_engine, inspect, text
-from sqlalchemy.engine import Engine
+import math
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from sqlalchemy import create_engine, inspect, make_url, text
+from sqlalchemy.engine import Engine, Inspector
 from sqlalchemy.exc import SQLAlchemyError
 
 
@@ -11,44 +15,251 @@ def _safe_type_name(raw_type: object) -> str:
     return str(raw_type).lower()
 
 
+_SAMPLE_OVERSAMPLING = 20
+# Block samples of only a handful of pages are usually empty or clustered.
+_SAMPLE_MIN_PAGES = 32
+
+
+def _create_source_engine(source_connection: str, sample_workers: int) -> Engine:
+    if make_url(source_connection).get_backend_name() == "sqlite":
+        return create_engine(source_connection)
+    # Sampling threads each hold one pooled connection; nothing else runs concurrently.
+    return create_engine(source_connection, pool_size=max(1, sample_workers), max_overflow=0)
+
+
+def _sample_query(
+    table_name: str,
+    dialect_name: str,
+    sample_row_limit: int,
+    row_count: int | None,
+    page_count: int | None = None,
+) -> str:
+    if dialect_name == "oracle":
+        limit_clause = f"FETCH FIRST {sample_row_limit} ROWS ONLY"
+    else:
+        limit_clause = f"LIMIT {sample_row_limit}"
+
+    # Block sampling reads only a fraction of the table's pages, spread across the table,
+    # instead of the first physical rows. The percentage selects pages, so it is sized from the
+    # page count. Small or never-analyzed tables are read directly.
+    if row_count and page_count:
+        rows_per_page = max(1.0, row_count / page_count)
+        pages = max(_SAMPLE_MIN_PAGES, math.ceil(sample_row_limit * _SAMPLE_OVERSAMPLING / rows_per_page))
+        if pages >= page_count:
+            return f"SELECT * FROM {table_name} {limit_clause}"
+        percent = max(0.0001, 100.0 * pages / page_count)
+        # Without an ordering the limit would stop inside the first sampled page; shuffling
+        # only sorts the sampled pages' rows.
+        if dialect_name == "postgresql":
+            return (
+                f"SELECT * FROM {table_name} TABLESAMPLE SYSTEM ({percent:.4f}) "
+                f"ORDER BY random() {limit_clause}"
+            )
+        if dialect_name == "oracle":
+            return (
+                f"SELECT * FROM {table_name} SAMPLE BLOCK ({percent:.4f}) "
+                f"ORDER BY dbms_random.value {limit_clause}"
+            )
+    return f"SELECT * FROM {table_name} {limit_clause}"
+
+
+def _set_statement_timeout(connection: Any, dialect_name: str, timeout_seconds: float) -> None:
+    if timeout_seconds <= 0:
+        return
+    timeout_ms = int(timeout_seconds * 1000)
+    if dialect_name == "postgresql":
+        connection.execute(text(f"SET LOCAL statement_timeout = {timeout_ms}"))
+    elif dialect_name == "oracle":
+        connection.connection.driver_connection.call_timeout = timeout_ms
+    elif dialect_name == "mysql":
+        connection.execute(text(f"SET SESSION max_execution_time = {timeout_ms}"))
+
+
 def _sample_rows(
     engine: Engine,
     table_name: str,
     dialect_name: str,
     sample_row_limit: int,
+    row_count: int | None = None,
+    timeout_seconds: float = 0.0,
+    page_count: int | None = None,
 ) -> list[dict[str, object]]:
     if sample_row_limit <= 0:
         return []
 
-    if dialect_name == "oracle":
-        query = text(f'SELECT * FROM {table_name} FETCH FIRST {sample_row_limit} ROWS ONLY')
-    else:
-        query = text(f'SELECT * FROM {table_name} LIMIT {sample_row_limit}')
+    query = _sample_query(table_name, dialect_name, sample_row_limit, row_count, page_count)
+    with engine.connect() as connection, connection.begin():
+        _set_statement_timeout(connection, dialect_name, timeout_seconds)
+        try:
+            rows = [dict(row) for row in connection.execute(text(query)).mappings()]
+            if len(rows) < sample_row_limit and "SAMPLE" in query:
+                # Block samples of skewed tables can come back short; top up from a plain read
+                # without repeating rows the sample already returned.
+                seen = {_row_identity(row) for row in rows}
+                plain_query = _sample_query(table_name, dialect_name, sample_row_limit + len(rows), None)
+                for row in connection.execute(text(plain_query)).mappings():
+                    if len(rows) >= sample_row_limit:
+                        break
+                    identity = _row_identity(row)
+                    if identity not in seen:
+                        seen.add(identity)
+                        rows.append(dict(row))
+        finally:
+            if dialect_name == "oracle" and timeout_seconds > 0:
+                connection.connection.driver_connection.call_timeout = 0
+    return rows
+
 
-    with engine.connect() as connection:
-        rows = connection.execute(query).mappings().all()
-    return [dict(row) for row in rows]
+def _row_identity(row: Any) -> tuple[str, ...]:
+    return tuple(repr(value) for value in row.values())
+
+
+def _sample_tables(
+    engine: Engine,
+    dialect_name: str,
+    table_names: list[str],
+    sample_row_limit: int,
+    row_counts: dict[str, int | None],
+    sample_workers: int,
+    timeout_seconds: float,
+    page_counts: dict[str, int | None] | None = None,
+) -> dict[str, list[dict[str, object]]]:
+    def _sample(table_name: str) -> list[dict[str, object]]:
+        try:
+            return _sample_rows(
+                engine=engine,
+                table_name=table_name,
+                dialect_name=dialect_name,
+                sample_row_limit=sample_row_limit,
+                row_count=row_counts.get(table_name),
+                timeout_seconds=timeout_seconds,
+                page_count=(page_counts or {}).get(table_name),
+            )
+        except (SQLAlchemyError, Exception):
+            # A slow or unreadable table loses its samples, not the whole introspection.
+            return []
+
+    # SQLite connections are per-thread (an in-memory database would be empty elsewhere).
+    workers = 1 if dialect_name == "sqlite" else min(sample_workers, len(table_names))
+    if workers <= 1:
+        return {table_name: _sample(table_name) for table_name in table_names}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return dict(zip(table_names, executor.map(_sample, table_names)))
+
+
+_TABLE_STATISTICS_QUERIES = {
+    "postgresql": """
+        SELECT c.relname AS table_name, c.reltuples AS row_count, c.relpages AS page_count
+        FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = current_schema() AND c.relkind IN ('r', 'p')
+    """,
+    "oracle": """
+        SELECT table_name, num_rows AS row_count, blocks AS page_count
+        FROM all_tables
+        WHERE owner = SYS_CONTEXT('USERENV', 'CURRENT_SCHEMA')
+    """,
+}
+_COLUMN_STATISTICS_QUERIES = {
+    "postgresql": """
+        SELECT tablename AS table_name, attname AS column_name, n_distinct AS num_distinct,
+               avg_width, null_frac AS null_fraction
+        FROM pg_stats
+        WHERE schemaname = current_schema()
+    """,
+    "oracle": """
+        SELECT s.table_name, s.column_name, s.num_distinct, s.avg_col_len AS avg_width,
+               s.num_nulls / NULLIF(t.num_rows, 0) AS null_fraction
+        FROM all_tab_col_statistics s
+        JOIN all_tables t ON t.owner = s.owner AND t.table_name = s.table_name
+        WHERE s.owner = SYS_CONTEXT('USERENV', 'CURRENT_SCHEMA')
+    """,
+}
+
+
+def _catalog_statistics(engine: Engine, dialect_name: str) -> dict[str, dict[str, object]]:
+    # Optimizer statistics are read from the catalog in two queries for the whole schema;
+    # nothing is scanned. Dialects without a known catalog (or missing grants) get none.
+    table_query = _TABLE_STATISTICS_QUERIES.get(dialect_name)
+    column_query = _COLUMN_STATISTICS_QUERIES.get(dialect_name)
+    if table_query is None or column_query is None:
+        return {}
+
+    statistics: dict[str, dict[str, object]] = {}
+    try:
+        with engine.connect() as connection:
+            for row in connection.execute(text(table_query)).mappings():
+                row_count = row["row_count"]
+                page_count = row.get("page_count")
+                # reltuples is -1 (or NUM_ROWS NULL) for tables that were never analyzed.
+                statistics[str(row["table_name"]).lower()] = {
+                    "row_count": int(row_count) if row_count is not None and row_count >= 0 else None,
+                    "page_count": int(page_count) if page_count else None,
+                    "columns": {},
+                }
+            for row in connection.execute(text(column_query)).mappings():
+                table_statistics = statistics.get(str(row["table_name"]).lower())
+                if table_statistics is None:
+                    continue
+                num_distinct = row["num_distinct"]
+                row_count = table_statistics["row_count"]
+                if num_distinct is not None and num_distinct < 0 and row_count is not None:
+                    # pg_stats reports distinct values as a negative fraction of the row count
+                    # when they scale with the table.
+                    num_distinct = -float(num_distinct) * row_count
+                table_statistics["columns"][str(row["column_name"]).lower()] = {
+                    "num_distinct": int(num_distinct) if num_distinct is not None else None,
+                    "avg_width": int(row["avg_width"]) if row["avg_width"] is not None else None,
+                    "null_fraction": (
+                        round(float(row["null_fraction"]), 4) if row["null_fraction"] is not None else None
+                    ),
+                }
+    except (SQLAlchemyError, Exception):
+        return {}
+    return statistics
+
+
+def _reflect_tables(
+    inspector: Inspector,
+    table_names: list[str],
+) -> dict[str, tuple[list[dict[str, Any]], dict[str, Any], list[dict[str, Any]]]]:
+    # One bulk reflection per object kind instead of three inspector calls per table;
+    # dialects with native support (Oracle, PostgreSQL) answer each with a single query.
+    multi_columns = inspector.get_multi_columns()
+    multi_primary_keys = inspector.get_multi_pk_constraint()
+    multi_foreign_keys = inspector.get_multi_foreign_keys()
+    return {
+        table_name: (
+            list(multi_columns.get((None, table_name), [])),
+            dict(multi_primary_keys.get((None, table_name)) or {}),
+            list(multi_foreign_keys.get((None, table_name), [])),
+        )
+        for table_name in table_names
+    }
 
 
 def introspect_source(
     source_connection: str,
     include_sample_rows: bool,
     sample_row_limit: int,
+    sample_workers: int = 4,
+    sample_timeout_seconds: float = 5.0,
 ) -> tuple[dict[str, object], str | None]:
-    engine = create_engine(source_connection)
+    engine = _create_source_engine(source_connection, sample_workers)
 
     try:
         inspector = inspect(engine)
         dialect_name = engine.dialect.name
         table_names = inspector.get_table_names()
+        catalog_statistics = _catalog_statistics(engine, dialect_name)
+        reflected_tables = _reflect_tables(inspector, table_names)
 
         tables: list[dict[str, object]] = []
         constraints: list[dict[str, object]] = []
 
         for table_name in table_names:
-            columns = inspector.get_columns(table_name)
-            primary_key = inspector.get_pk_constraint(table_name)
-            foreign_keys = inspector.get_foreign_keys(table_name)
+            columns, primary_key, foreign_keys = reflected_tables[table_name]
+            table_statistics = catalog_statistics.get(table_name.lower(), {})
+            column_statistics = table_statistics.get("columns", {})
 
             table_payload: dict[str, object] = {
                 "name": table_name,
@@ -57,21 +268,15 @@ def introspect_source(
                         "name": column["name"],
                         "type": _safe_type_name(column.get("type")),
                         "nullable": bool(column.get("nullable", True)),
+                        **column_statistics.get(str(column["name"]).lower(), {}),
                     }
                     for column in columns
                 ],
                 "primary_key": primary_key.get("constrained_columns", []),
                 "foreign_keys": foreign_keys,
+                "row_count": table_statistics.get("row_count"),
             }
 
-            if include_sample_rows:
-                table_payload["sample_rows"] = _sample_rows(
-                    engine=engine,
-                    table_name=table_name,
-                    dialect_name=dialect_name,
-                    sample_row_limit=sample_row_limit,
-                )
-
             tables.append(table_payload)
 
             if primary_key.get("constrained_columns"):
@@ -94,6 +299,23 @@ def introspect_source(
                     }
                 )
 
+        if include_sample_rows:
+            sample_rows = _sample_tables(
+                engine=engine,
+                dialect_name=dialect_name,
+                table_names=table_names,
+                sample_row_limit=sample_row_limit,
+                row_counts={str(table["name"]): table["row_count"] for table in tables},
+                sample_workers=sample_workers,
+                timeout_seconds=sample_timeout_seconds,
+                page_counts={
+                    table_name: catalog_statistics.get(table_name.lower(), {}).get("page_count")
+                    for table_name in table_names
+                },
+            )
+            for table in tables:
+                table["sample_rows"] = sample_rows[str(table["name"])]
+
         return {"tables": tables, "constraints": constraints}, None
     except (SQLAlchemyError, Exception) as exc:
         return {"tables": [], "constraints": []}, str(exc)
@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+from math import prod
+
+
+def _edge_columns(edge: dict[str, object], key: str) -> list[str]:
+    on_payload = edge.get("on")
+    if not isinstance(on_payload, dict):
+        return []
+    raw_columns = on_payload.get(key, [])
+    if not isinstance(raw_columns, list):
+        return []
+    return [str(value) for value in raw_columns]
+
+
+def _row_count(profile: dict[str, object] | None) -> int | None:
+    if not profile:
+        return None
+    value = profile.get("row_count")
+    if isinstance(value, (int, float)) and value >= 0:
+        return int(value)
+    return None
+
+
+def _column_profile(profile: dict[str, object] | None, column_name: str) -> dict[str, object] | None:
+    if not profile:
+        return None
+    for column in profile.get("columns", []):
+        if isinstance(column, dict) and str(column.get("name", "")).lower() == column_name.lower():
+            return column
+    return None
+
+
+def _key_multiplicity(
+    profile: dict[str, object] | None,
+    key: str,
+    is_referenced_side: bool,
+    other_profile: dict[str, object] | None,
+) -> tuple[float, str]:
+    """Estimate how many rows of a joined table match one value of its join key."""
+    primary_key = [str(column).lower() for column in (profile or {}).get("primary_key", [])]
+    if primary_key == [key.lower()]:
+        return 1.0, "primary_key"
+    if is_referenced_side:
+        # A foreign key references a unique key of its parent table.
+        return 1.0, "foreign_key"
+
+    rows = _row_count(profile)
+    column = _column_profile(profile, key) or {}
+    distinct = column.get("num_distinct")
+    if rows and isinstance(distinct, (int, float)) and distinct != 0:
+        # Negative values follow pg_stats: a fraction of the row count.
+        distinct_values = -distinct * rows if distinct < 0 else distinct
+        if distinct_values > 0:
+            return max(1.0, rows / distinct_values), "statistics"
+
+    other_rows = _row_count(other_profile)
+    if rows and other_rows:
+        return max(1.0, rows / other_rows), "row_counts"
+
+    values = [
+        row.get(key)
+        for row in (profile or {}).get("sample_rows", [])
+        if isinstance(row, dict) and row.get(key) is not None
+    ]
+    if values:
+        return max(1.0, len(values) / len(set(map(str, values)))), "sample"
+    return 1.0, "unknown"
+
+
+def _estimate_edge(
+    edge: dict[str, object],
+    merged_tables: set[str],
+    profiles: dict[str, dict[str, object]],
+) -> dict[str, object] | None:
+    from_table = str(edge.get("from", "")).strip()
+    to_table = str(edge.get("to", "")).strip()
+    from_columns = _edge_columns(edge, "from_columns")
+    to_columns = _edge_columns(edge, "to_columns")
+    if not from_columns or not to_columns:
+        return None
+
+    # Mirrors the generated merge: the edge extends whichever side is already merged.
+    if from_table in merged_tables:
+        join_table, join_key, anchor_table, referenced = to_table, to_columns[0], from_table, True
+    elif to_table in merged_tables:
+        join_table, join_key, anchor_table, referenced = from_table, from_columns[0], to_table, False
+    else:
+        return None
+
+    multiplicity, source = _key_multiplicity(
+        profiles.get(join_table.lower()),
+        join_key,
+        referenced,
+        profiles.get(anchor_table.lower()),
+    )
+    return {
+        "from": from_table,
+        "to": to_table,
+        "join_table": join_table,
+        "join_key": join_key,
+        "multiplicity": round(multiplicity, 4),
+        "estimate_source": source,
+        "join_table_rows": _row_count(profiles.get(join_table.lower())),
+    }
+
+
+def plan_joins(
+    join_edges: list[dict[str, object]],
+    table_profiles: list[dict[str, object]],
+    max_fan_out: float,
+    policy: str = "warn",
+) -> tuple[list[dict[str, object]], dict[str, object]]:
+    """Order join edges smallest fan-out first and estimate the joined row count.
+
+    The driving table stays the FK side of the first edge, as in the generated script, and
+    its first merge is always one of its own edges so the script resolves the same table.
+    """
+    edges = [edge for edge in join_edges if isinstance(edge, dict)]
+    profiles = {
+        str(profile.get("name", "")).lower(): profile
+        for profile in table_profiles
+        if isinstance(profile, dict)
+    }
+    if not edges:
+        return [], {
+            "seed_table": None,
+            "seed_rows": None,
+            "edges": [],
+            "fan_out": 1.0,
+            "estimated_rows": None,
+            "max_fan_out": max_fan_out,
+            "policy": policy,
+            "status": "ok",
+        }
+
+    seed_table = str(edges[0].get("from", "")).strip()
+    merged_tables = {seed_table}
+    remaining = list(enumerate(edges))
+    ordered: list[dict[str, object]] = []
+    estimates: list[dict[str, object]] = []
+
+    while remaining:
+        candidates = []
+        for position, edge in remaining:
+            if not ordered and str(edge.get("from", "")).strip() != seed_table:
+                continue
+            estimate = _estimate_edge(edge, merged_tables, profiles)
+            if estimate is not None:
+                rows = estimate["join_table_rows"]
+                candidates.append(
+                    (
+                        (estimate["multiplicity"], rows if rows is not None else float("inf"), position),
+                        position,
+                        edge,
+                        estimate,
+                    )
+                )
+        if not candidates:
+            break
+        _, position, edge, estimate = min(candidates, key=lambda candidate: candidate[0])
+        remaining = [item for item in remaining if item[0] != position]
+        merged_tables.update({str(edge.get("from", "")).strip(), str(edge.get("to", "")).strip()})
+        ordered.append(edge)
+        estimates.append(estimate)
+
+    # Edges that never connect to the driving table keep their original relative order.
+    ordered.extend(edge for _, edge in remaining)
+
+    seed_rows = _row_count(profiles.get(seed_table.lower()))
+    running = 1.0
+    for estimate in estimates:
+        running *= float(estimate["multiplicity"])
+        estimate["cumulative_fan_out"] = round(running, 4)
+        estimate["estimated_rows"] = round(seed_rows * running) if seed_rows is not None else None
+
+    fan_out = prod(float(estimate["multiplicity"]) for estimate in estimates)
+    exceeded = fan_out > max_fan_out
+    return ordered, {
+        "seed_table": seed_table,
+        "seed_rows": seed_rows,
+        "edges": estimates,
+        "fan_out": round(fan_out, 4),
+        "estimated_rows": round(seed_rows * fan_out) if seed_rows is not None else None,
+        "max_fan_out": max_fan_out,
+        "policy": policy,
+        "status": ("refused" if policy == "refuse" else "warning") if exceeded else "ok",
+    }
+
+
+def fan_out_message(estimates: dict[str, object]) -> str | None:
+    if estimates.get("status") == "ok":
+        return None
+    worst = max(estimates.get("edges", []), key=lambda item: item["multiplicity"], default=None)
+    detail = f" (largest step: {worst['from']} -> {worst['to']}, x{worst['multiplicity']})" if worst else ""
+    action = "refusing to run the migration" if estimates.get("status") == "refused" else "review the joins"
+    return (
+        f"Projected join fan-out x{estimates['fan_out']} exceeds the limit of x{estimates['max_fan_out']}"
+        f"{detail}; {action} or use DOCUMENT_MODE=entity."
+    )
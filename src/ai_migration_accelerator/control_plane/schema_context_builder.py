@@ -18,6 +18,8 @@ def build_schema_context(raw_metadata: dict[str, object]) -> dict[str, object]:
                 "name": table_name,
                 "column_count": len(columns),
                 "columns": columns,
+                "primary_key": table.get("primary_key", []),
+                "row_count": table.get("row_count"),
                 "sample_rows": sample_rows,
             }
         )
@@ -21,11 +21,48 @@ class AppSettings(BaseSettings):
 
     include_sample_rows: bool = True
     sample_row_limit: int = 3
+    sample_workers: int = 4
+    sample_timeout_seconds: float = 5.0
 
     embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2"
+    embedding_backend: str = "torch"
     hf_token: str | None = None
     hf_token_env_var: str = "HF_TOKEN"
     vector_dim: int = 384
+    embedding_batch_size: int = 64
+    embedding_reduction: str = "truncate"
+    embedding_projection_sample: int = 4096
+    embedding_chunking: bool = True
+    embedding_max_tokens: int = 0
+    embedding_chunk_overlap: int = 32
+    embedding_processes: int = 0
+    embedding_threads_per_process: int = 0
+    embedding_onnx_quantization: str = "avx2"
+    embedding_drift_sample: int = 64
+    embedding_max_drift: float = 0.02
+    embedding_cache_dir: str | None = ".embedding_cache"
+    embedding_cache_max_mb: float = 2048
+    streaming_extract: bool = True
+    extract_chunk_size: int = 50000
+    extract_workers: int = 4
+    source_join_mode: str = "sql"
+    document_mode: str = "rows"
+    document_root: str | None = None
+    max_join_fan_out: float = 100.0
+    join_fan_out_policy: str = "warn"
+    load_method: str = "copy"
+    load_batch_size: int = 10000
+    vector_storage: str | None = None
+    vector_index: str | None = None
+    vector_index_metric: str = "cosine"
+    index_maintenance_work_mem: str = "1GB"
+    index_parallel_workers: int = 4
+    resumable_load: bool = True
+    incremental_load: bool = False
+    pipeline_mode: bool = True
+    pipeline_queue_size: int = 4
+    embed_workers: int = 1
+    load_workers: int = 1
 
     vector_table: str = "rag_documents"
     run_containerized_migration: bool = False
@@ -24,9 +24,15 @@ class RunContext(BaseModel):
     llm_model: str = "gemini-1.5-pro"
     include_sample_rows: bool = True
     sample_row_limit: int = 3
+    sample_workers: int = 4
+    sample_timeout_seconds: float = 5.0
     embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2"
+    embedding_backend: str = "torch"
     hf_token_env_var: str = "HF_TOKEN"
+    embedding_cache_dir: str | None = None
     vector_table: str = "rag_documents"
+    max_join_fan_out: float = 100.0
+    join_fan_out_policy: str = "warn"
     run_containerized_migration: bool = False
     container_runtime: str = "podman"
     container_network_mode: str = "auto"
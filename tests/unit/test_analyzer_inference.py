@@ -74,3 +74,40 @@ def test_selects_multiple_embedding_columns_from_same_table():
     assert "notes" in selected_columns
     assert "description" in selected_columns
     assert analyzed.mapping_plan["workflow_summary"]["selected_embedding_column_count"] >= 3
+
+
+def test_detects_watermark_columns_with_oracle_scn_fallback():
+    context = RunContext(
+        source_type="oracle",
+        source_connection="oracle+oracledb://u:p@localhost:1521/source",
+        target_connection="postgresql+psycopg://u:p@localhost:5432/target",
+    )
+    state = WorkflowState(
+        run_id="watermark-test",
+        context=context,
+        schema_context={
+            "table_profiles": [
+                {
+                    "name": "orders",
+                    "columns": [
+                        {"name": "id", "type": "number"},
+                        {"name": "updated_note", "type": "varchar2(100)"},
+                        {"name": "last_modified", "type": "date"},
+                        {"name": "updated_at", "type": "timestamp(6)"},
+                    ],
+                },
+                {
+                    "name": "customers",
+                    "columns": [{"name": "id", "type": "number"}],
+                },
+            ],
+            "join_graph": [],
+        },
+    )
+
+    analyzed = analyze_schema(state)
+    watermarks = analyzed.mapping_plan["watermark_columns"]
+
+    assert watermarks["orders"] == {"column": "updated_at", "kind": "timestamp"}
+    assert watermarks["customers"] == {"column": "ORA_ROWSCN", "kind": "scn"}
+    assert analyzed.mapping_plan["workflow_summary"]["watermark_table_count"] == 1
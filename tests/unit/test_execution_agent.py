@@ -1,7 +1,12 @@
+from ai_migration_accelerator.agents import execution_agent
 from ai_migration_accelerator.agents.execution_agent import (
+    _migration_env_args,
     _prepare_container_connections,
     _resolve_container_network,
+    execute_migration,
 )
+from ai_migration_accelerator.core.settings import AppSettings
+from ai_migration_accelerator.graph.router import should_validate
 from ai_migration_accelerator.models.state import RunContext, WorkflowState
 
 
@@ -73,3 +78,33 @@ def test_resolve_container_network_uses_explicit_name():
     network_name = _resolve_container_network(state)
 
     assert network_name == "ops_default"
+
+
+def test_execute_migration_refuses_plans_over_the_fan_out_limit():
+    state = _build_state(
+        source_connection="postgresql+psycopg://u:p@db:5432/source",
+        target_connection="postgresql+psycopg://u:p@db:5432/target",
+    )
+    state.mapping_plan["join_estimates"] = {"status": "refused", "fan_out": 400.0, "max_fan_out": 100.0}
+
+    result = execute_migration(state)
+
+    assert result.execution_report["status"] == "failed"
+    assert result.execution_report["reason"] == "join_fan_out"
+    assert should_validate(result) == "gate_review"
+
+
+def test_migration_env_is_built_from_settings_and_skips_unset_overrides(monkeypatch):
+    monkeypatch.delenv("LOAD_BATCH_SIZE", raising=False)
+    settings = AppSettings(_env_file=None, load_batch_size=500, pipeline_mode=False, vector_index="hnsw")
+    monkeypatch.setattr(execution_agent, "get_settings", lambda: settings)
+
+    env_args = _migration_env_args()
+    forwarded = dict(value.split("=", 1) for value in env_args[1::2])
+
+    assert env_args[::2] == ["-e"] * len(forwarded)
+    assert forwarded["LOAD_BATCH_SIZE"] == "500"
+    assert forwarded["PIPELINE_MODE"] == "false"
+    assert forwarded["VECTOR_INDEX"] == "hnsw"
+    assert forwarded["EMBEDDING_ONNX_QUANTIZATION"] == "avx2"
+    assert "VECTOR_STORAGE" not in forwarded and "DOCUMENT_ROOT" not in forwarded
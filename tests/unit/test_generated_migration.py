@@ -0,0 +1,853 @@
+import json
+import struct
+import sys
+import time
+from contextlib import nullcontext
+from datetime import datetime
+from multiprocessing import shared_memory
+from types import ModuleType
+
+import numpy as np
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, event, text
+
+from ai_migration_accelerator.agents import codegen_agent
+from ai_migration_accelerator.agents.codegen_agent import generate_code
+from ai_migration_accelerator.connectors.postgres import introspection
+from ai_migration_accelerator.models.state import RunContext, WorkflowState
+
+
+@pytest.fixture(autouse=True)
+def _offline_target(monkeypatch):
+    # Code generation probes the target DSN; keep rendering off the network.
+    monkeypatch.setattr(codegen_agent, "pgvector_capabilities", lambda _target: introspection._static_capabilities())
+
+
+def _render_script(mapping_plan: dict[str, object]) -> str:
+    context = RunContext(
+        source_type="postgresql",
+        source_connection="sqlite://",
+        target_connection="postgresql+psycopg://u:p@localhost:5432/target",
+    )
+    state = WorkflowState(run_id="generated-migration-test", context=context, mapping_plan=mapping_plan)
+    return generate_code(state).generated_artifacts["migrate.py"]
+
+
+class FakeSentenceTransformer:
+    encode_calls: list[dict[str, object]] = []
+
+    def __init__(self, model_name: str, **_: object) -> None:
+        self.model_name = model_name
+
+    def encode(self, payloads, **kwargs):
+        FakeSentenceTransformer.encode_calls.append({"payloads": list(payloads), **kwargs})
+        return np.array([[float(len(payload)), 1.0] for payload in payloads], dtype=np.float64)
+
+
+def _load_script(script: str, monkeypatch) -> ModuleType:
+    FakeSentenceTransformer.encode_calls = []
+    fake_sentence_transformers = ModuleType("sentence_transformers")
+    fake_sentence_transformers.SentenceTransformer = FakeSentenceTransformer
+    monkeypatch.setitem(sys.modules, "sentence_transformers", fake_sentence_transformers)
+
+    module = ModuleType("generated_migrate")
+    exec(compile(script, "migrate.py", "exec"), module.__dict__)
+    return module
+
+
+def _orders_plan() -> dict[str, object]:
+    return {
+        "business_entities": [{"table": "customers"}, {"table": "orders"}],
+        "join_logic": [
+            {
+                "from": "orders",
+                "to": "customers",
+                "on": {"from_columns": ["customer_id"], "to_columns": ["id"]},
+            }
+        ],
+        "selected_embedding_column": {"table": "orders", "column": "note"},
+        "selected_embedding_columns": ["note"],
+    }
+
+
+def _seed_orders(engine, order_count: int) -> None:
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE customers (id INTEGER, name TEXT)"))
+        connection.execute(text("CREATE TABLE orders (id INTEGER, customer_id INTEGER, note TEXT)"))
+        connection.execute(text("INSERT INTO customers VALUES (1, 'Ada'), (2, 'Linus')"))
+        for order_id in range(order_count):
+            connection.execute(
+                text("INSERT INTO orders VALUES (:id, :customer_id, :note)"),
+                {"id": order_id, "customer_id": 1 + order_id % 2, "note": f"note {order_id}"},
+            )
+
+
+def test_streaming_extraction_yields_bounded_chunks_joined_to_lookup_tables(monkeypatch):
+    monkeypatch.setenv("EXTRACT_CHUNK_SIZE", "4")
+    module = _load_script(_render_script(_orders_plan()), monkeypatch)
+    engine = create_engine("sqlite://")
+    _seed_orders(engine, order_count=10)
+
+    with engine.connect() as connection:
+        chunks = list(module._iter_merged_chunks(connection, ["customers", "orders"]))
+
+    assert [len(chunk.index) for chunk in chunks] == [4, 4, 2]
+    merged = pd.concat(chunks)
+    assert merged.index.is_unique
+    assert set(merged["name"]) == {"Ada", "Linus"}
+
+
+def test_migration_id_does_not_depend_on_join_order(monkeypatch):
+    plan = _orders_plan()
+    plan["business_entities"].append({"table": "order_items"})
+    plan["join_logic"].append(
+        {
+            "from": "order_items",
+            "to": "orders",
+            "on": {"from_columns": ["order_id"], "to_columns": ["id"]},
+        }
+    )
+    reordered = {**plan, "join_logic": list(reversed(plan["join_logic"]))}
+
+    first = _load_script(_render_script(plan), monkeypatch)
+    second = _load_script(_render_script(reordered), monkeypatch)
+
+    assert first.JOIN_LOGIC != second.JOIN_LOGIC
+    assert first.MIGRATION_ID == second.MIGRATION_ID
+
+
+def test_generated_script_compiles_with_streaming_settings():
+    script = _render_script(_orders_plan())
+
+    compile(script, "migrate.py", "exec")
+    assert 'os.getenv("EXTRACT_CHUNK_SIZE", "50000")' in script
+    assert "stream_results=True" in script
+
+
+def test_encode_batch_returns_float32_matrix_from_single_encode_call(monkeypatch):
+    monkeypatch.setenv("VECTOR_DIM", "4")
+    monkeypatch.setenv("EMBEDDING_BATCH_SIZE", "16")
+    module = _load_script(_render_script(_orders_plan()), monkeypatch)
+
+    embeddings = module._encode_batch(["a", "bbb", "cc"])
+
+    assert embeddings.dtype == np.float32
+    assert embeddings.shape == (3, 4)
+    assert embeddings[:, 0].tolist() == [1.0, 3.0, 2.0]
+    assert embeddings[:, 2:].sum() == 0.0
+    assert len(FakeSentenceTransformer.encode_calls) == 1
+    assert FakeSentenceTransformer.encode_calls[0]["batch_size"] == 16
+
+
+def test_entity_mode_folds_one_to_many_children_into_one_document_per_parent(monkeypatch):
+    monkeypatch.setenv("DOCUMENT_MODE", "entity")
+    monkeypatch.setenv("EXTRACT_CHUNK_SIZE", "1")
+    plan = _orders_plan()
+    plan["join_logic"].append(
+        {
+            "from": "payments",
+            "to": "customers",
+            "on": {"from_columns": ["customer_id"], "to_columns": ["id"]},
+        }
+    )
+    script = _render_script(plan)
+    module = _load_script(script, monkeypatch)
+    engine = create_engine("sqlite://")
+    _seed_orders(engine, order_count=4)
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE payments (customer_id INTEGER, method TEXT)"))
+        connection.execute(text("INSERT INTO payments VALUES (1, 'card'), (1, 'wire'), (2, 'card')"))
+
+    with engine.connect() as connection:
+        chunks = list(
+            module._iter_merged_chunks(connection, ["customers", "orders", "payments"], key_column="id")
+        )
+
+    assert 'os.getenv("DOCUMENT_ROOT", "customers")' in script
+    merged = pd.concat(chunks)
+    assert merged["name"].tolist() == ["Ada", "Linus"]
+    assert merged["note"].tolist() == ["note 0\nnote 2", "note 1\nnote 3"]
+    assert merged["method"].tolist() == ["card\nwire", "card"]
+    merged["embedding_input"] = merged["note"]
+    assert module._load_frame(merged)["source_part"].tolist() == [0, 0]
+
+
+def test_encode_copy_rows_writes_pgcopy_binary_with_pgvector_payload(monkeypatch):
+    module = _load_script(_render_script(_orders_plan()), monkeypatch)
+    embeddings = np.array([[0.5, -1.0, 2.0]], dtype=np.float32)
+
+    module.RUN_ID = "run-1"
+    rows = pd.DataFrame(
+        {
+            "source_key": ["42"],
+            "source_part": [1],
+            "chunk_index": [3],
+            "content": ["hello"],
+            "metadata": ['{"k": 1}'],
+        }
+    )
+
+    payload = module._encode_copy_rows(rows, embeddings)
+
+    assert payload.startswith(b"PGCOPY\n\xff\r\n\x00")
+    assert payload.endswith(b"\xff\xff")
+    body = payload[19:-2]
+    assert struct.unpack("!h", body[:2]) == (7,)
+    assert body[2:6] == struct.pack("!i", 2) and body[6:8] == b"42"
+    assert body[8:16] == struct.pack("!ii", 4, 1)
+    assert body[16:24] == struct.pack("!ii", 4, 3)
+    assert body[24:28] == struct.pack("!i", 5) and body[28:33] == b"hello"
+    vector_length = struct.unpack("!i", body[33:37])[0]
+    assert vector_length == 4 + 3 * 4
+    assert struct.unpack("!hh3f", body[37 : 37 + vector_length]) == (3, 0, 0.5, -1.0, 2.0)
+    run_id_start = 37 + vector_length
+    assert body[run_id_start : run_id_start + 9] == struct.pack("!i", 5) + b"run-1"
+    assert body[run_id_start + 13 :] == b'\x01{"k": 1}'
+
+
+def test_vector_rows_keep_only_row_metadata_and_reference_the_run(monkeypatch):
+    module = _load_script(_render_script(_orders_plan()), monkeypatch)
+    merged = pd.DataFrame(
+        {
+            "id": [7, 8],
+            "note": ["first", "second"],
+            "embedding_input": ["first", "second"],
+        }
+    )
+    merged[module.SOURCE_KEY_COLUMN] = merged["id"]
+    module.PRIMARY_KEYS = {"orders": ["id"]}
+    engine, statements = _recording_engine()
+
+    rows = module._load_frame(merged, "orders")
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "CREATE TABLE migration_runs (run_id TEXT PRIMARY KEY, migration_id TEXT, "
+                "vector_table TEXT, source_table TEXT, join_logic TEXT, embedding_columns TEXT, "
+                "business_filters TEXT, embedding_model TEXT, status TEXT, rows_loaded INTEGER, "
+                "finished_at TEXT)"
+            )
+        )
+        module._write_run(connection, "orders", ["note"], [], "running")
+        module._write_run(connection, "orders", ["note"], [], "completed", 2)
+        run_rows = connection.execute(
+            text("SELECT source_table, status, rows_loaded, finished_at FROM migration_runs")
+        ).all()
+
+    assert [json.loads(item) for item in rows["metadata"]] == [
+        {"source_table": "orders", "primary_key": {"id": 7}},
+        {"source_table": "orders", "primary_key": {"id": 8}},
+    ]
+    assert run_rows == [("orders", "completed", 2, "2026-01-01T00:00:00")]
+    assert sum("INSERT INTO migration_runs" in statement for statement in statements) == 2
+
+
+def test_encode_batch_deduplicates_inputs_and_reuses_persistent_cache(monkeypatch, tmp_path):
+    monkeypatch.setenv("VECTOR_DIM", "2")
+    monkeypatch.setenv("EMBEDDING_CACHE_DIR", str(tmp_path))
+    script = _render_script(_orders_plan())
+
+    first_run = _load_script(script, monkeypatch)
+    first = first_run._encode_batch(["same", "other", "same"])
+    first_run._EMBEDDING_CACHE.close()
+
+    assert FakeSentenceTransformer.encode_calls[0]["payloads"] == ["same", "other"]
+    assert first_run._EMBEDDING_STATS["duplicate_inputs"] == 1
+    assert first_run._EMBEDDING_STATS["cache_misses"] == 2
+
+    second_run = _load_script(script, monkeypatch)
+    second = second_run._encode_batch(["other", "same", "new"])
+
+    assert FakeSentenceTransformer.encode_calls[0]["payloads"] == ["new"]
+    assert second_run._EMBEDDING_STATS["cache_hits"] == 2
+    assert np.array_equal(second[:2], first[[1, 0]])
+
+
+def test_evict_embedding_cache_drops_least_recently_used_entries(monkeypatch, tmp_path):
+    monkeypatch.setenv("VECTOR_DIM", "2")
+    monkeypatch.setenv("EMBEDDING_CACHE_DIR", str(tmp_path))
+    monkeypatch.setenv("EMBEDDING_CACHE_MAX_MB", str(200 / (1024 * 1024)))
+    module = _load_script(_render_script(_orders_plan()), monkeypatch)
+
+    for payload in ["a", "b", "c", "d"]:
+        module._encode_batch([payload])
+    module._evict_embedding_cache()
+
+    remaining = module._get_embedding_cache().execute("SELECT COUNT(*) FROM embedding_cache").fetchone()[0]
+    assert remaining == 2
+    assert module._EMBEDDING_STATS["evicted_entries"] == 2
+
+
+def test_resumable_extraction_orders_by_primary_key_and_numbers_fan_out_rows(monkeypatch):
+    plan = _orders_plan()
+    plan["join_logic"] = [
+        {
+            "from": "customers",
+            "to": "orders",
+            "on": {"from_columns": ["id"], "to_columns": ["customer_id"]},
+        }
+    ]
+    plan["columns"] = [
+        {"table": "customers", "column": "id"},
+        {"table": "customers", "column": "name"},
+    ]
+    module = _load_script(_render_script(plan), monkeypatch)
+    engine = create_engine("sqlite://")
+    _seed_orders(engine, order_count=5)
+
+    assert module._resolve_key_column("customers") == "id"
+    with engine.connect() as connection:
+        chunks = list(
+            module._iter_merged_chunks(
+                connection,
+                ["customers", "orders"],
+                key_column="id",
+                resume_key=2,
+            )
+        )
+
+    merged = pd.concat(chunks)
+    merged["embedding_input"] = merged["note"]
+    rows = module._load_frame(merged)
+    assert set(rows["source_key"]) == {"2"}
+    assert sorted(rows["source_part"]) == [0, 1]
+
+
+def test_incremental_query_bounds_driving_table_by_watermark(monkeypatch):
+    module = _load_script(_render_script(_orders_plan()), monkeypatch)
+    low = datetime(2026, 1, 1, 8, 30)
+    high = datetime(2026, 1, 2, 8, 30)
+
+    query, params = module._table_query(
+        "orders",
+        "id",
+        None,
+        {"column": "updated_at", "low": low, "high": high},
+    )
+
+    assert query == (
+        "SELECT * FROM orders WHERE updated_at > :watermark_low "
+        "AND updated_at <= :watermark_high ORDER BY id"
+    )
+    assert params == {"watermark_low": low, "watermark_high": high}
+    assert module._decode_key_value(module._encode_key_value(high)) == high
+    assert module._decode_key_value(module._encode_key_value(np.int64(7))) == 7
+
+
+def test_incremental_mode_is_disabled_without_a_stable_driving_key(monkeypatch):
+    monkeypatch.setenv("INCREMENTAL_LOAD", "true")
+    module = _load_script(_render_script(_orders_plan()), monkeypatch)
+    module.WATERMARK_COLUMNS = {
+        "events": {"column": "updated_at", "kind": "timestamp"},
+        "orders": {"column": "updated_at", "kind": "timestamp"},
+    }
+    module.TABLE_COLUMNS = {"events": ["note", "updated_at"], "orders": ["id", "note", "updated_at"]}
+    module.PRIMARY_KEYS = {}
+
+    assert module._incremental_disabled_reason("events") == "no_stable_key"
+    assert module._resolve_watermark(None, None, "events", resuming=False) is None
+    assert module._incremental_disabled_reason("orders") is None
+    assert module._incremental_disabled_reason("customers") == "no_watermark_column"
+
+
+def test_business_filters_are_pushed_into_source_queries(monkeypatch):
+    plan = _orders_plan()
+    plan["columns"] = [
+        {"table": "orders", "column": "id", "source_type": "integer"},
+        {"table": "orders", "column": "customer_id", "source_type": "integer"},
+        {"table": "orders", "column": "note", "source_type": "text"},
+        {"table": "customers", "column": "id", "source_type": "integer"},
+        {"table": "customers", "column": "name", "source_type": "varchar"},
+    ]
+    plan["business_filters"] = [
+        {"table": "orders", "column": "customer_id", "operator": "!=", "value": "2", "source": "test"},
+        {"table": "customers", "column": "name", "operator": "==", "value": "ada", "source": "test"},
+        {"table": "missing_table", "column": "name", "operator": "==", "value": "ada", "source": "test"},
+    ]
+    module = _load_script(_render_script(plan), monkeypatch)
+    engine = create_engine("sqlite://")
+    _seed_orders(engine, order_count=6)
+
+    assert [predicate["filter_index"] for predicate in module.FILTER_PREDICATES] == [0, 1]
+    pushdown = module._pushdown_modes(["customers", "orders"], "orders")
+    assert pushdown == {0: "source", 1: "source_prefilter"}
+
+    with engine.connect() as connection:
+        merged = pd.concat(list(module._iter_merged_chunks(connection, ["customers", "orders"])))
+    filtered, applied = module._apply_business_filters(merged, pushdown)
+
+    assert sorted(merged["id_left"]) == [0, 2, 4]
+    assert set(filtered["name"]) == {"Ada"}
+    assert [item["pushed_down"] for item in applied] == [True, True, False]
+
+
+def test_source_queries_select_only_projected_columns(monkeypatch):
+    plan = _orders_plan()
+    plan["columns"] = [
+        {"table": "orders", "column": "id", "source_type": "number"},
+        {"table": "orders", "column": "customer_id", "source_type": "number"},
+        {"table": "orders", "column": "note", "source_type": "varchar2"},
+        {"table": "orders", "column": "scanned_invoice", "source_type": "blob"},
+        {"table": "customers", "column": "id", "source_type": "number"},
+        {"table": "customers", "column": "name", "source_type": "varchar2"},
+        {"table": "customers", "column": "tier", "source_type": "varchar2"},
+        {"table": "customers", "column": "contract_pdf", "source_type": "blob"},
+    ]
+    plan["business_filters"] = [
+        {"table": "customers", "column": "tier", "operator": "==", "value": "gold", "source": "test"},
+    ]
+    module = _load_script(_render_script(plan), monkeypatch)
+
+    assert module.COLUMN_PROJECTION == {
+        "orders": ["id", "customer_id", "note"],
+        "customers": ["id", "tier"],
+    }
+    query, _ = module._table_query("customers", None, None)
+    assert query == "SELECT id, tier FROM customers"
+
+
+def test_sql_join_matches_pandas_merge_and_keeps_fan_out_keys_together(monkeypatch):
+    monkeypatch.setenv("EXTRACT_CHUNK_SIZE", "3")
+    plan = _orders_plan()
+    plan["join_logic"] = [
+        {
+            "from": "customers",
+            "to": "orders",
+            "on": {"from_columns": ["id"], "to_columns": ["customer_id"]},
+        }
+    ]
+    plan["columns"] = [
+        {"table": "customers", "column": "id"},
+        {"table": "customers", "column": "name"},
+        {"table": "orders", "column": "id"},
+        {"table": "orders", "column": "customer_id"},
+        {"table": "orders", "column": "note"},
+    ]
+    module = _load_script(_render_script(plan), monkeypatch)
+    engine = create_engine("sqlite://")
+    _seed_orders(engine, order_count=8)
+
+    table_names = ["customers", "orders"]
+    join_plan = module._build_join_query(table_names, module._resolve_seed_table(table_names))
+    assert join_plan is not None
+    with engine.connect() as connection:
+        pandas_chunks = list(module._iter_merged_chunks(connection, table_names, key_column="id"))
+        sql_chunks = list(
+            module._iter_merged_chunks(connection, table_names, key_column="id", join_plan=join_plan)
+        )
+
+    # Each customer owns four orders; regrouping keeps them in one chunk despite the size of 3.
+    assert [set(chunk["id_left"]) for chunk in sql_chunks] == [{1}, {2}]
+    columns = ["id_left", "id_right", "customer_id", "note"]
+    expected = pd.concat(pandas_chunks)[columns].sort_values(["id_left", "id_right"])
+    actual = pd.concat(sql_chunks)[columns].sort_values(["id_left", "id_right"])
+    pd.testing.assert_frame_equal(
+        actual.reset_index(drop=True), expected.reset_index(drop=True), check_dtype=False
+    )
+    assert pd.concat(sql_chunks)[module.SOURCE_KEY_COLUMN].tolist() == [1] * 4 + [2] * 4
+
+
+def test_lookup_tables_load_concurrently_and_record_per_table_timings(monkeypatch, tmp_path):
+    monkeypatch.setenv("EXTRACT_WORKERS", "2")
+    plan = _orders_plan()
+    plan["business_entities"].append({"table": "regions"})
+    module = _load_script(_render_script(plan), monkeypatch)
+    engine = create_engine(f"sqlite:///{tmp_path / 'source.db'}")
+    _seed_orders(engine, order_count=6)
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE regions (id INTEGER, label TEXT)"))
+        connection.execute(text("INSERT INTO regions VALUES (1, 'north')"))
+
+    timings: dict[str, dict[str, object]] = {}
+    table_names = ["customers", "orders", "regions"]
+    lookup_tables = module._load_lookup_tables(engine, table_names, "orders", timings)
+    with engine.connect() as connection:
+        merged = pd.concat(
+            list(
+                module._iter_merged_chunks(
+                    connection,
+                    table_names,
+                    lookup_tables=lookup_tables,
+                    timings=timings,
+                )
+            )
+        )
+
+    assert sorted(lookup_tables) == ["customers", "regions"]
+    assert set(merged["name"]) == {"Ada", "Linus"}
+    assert {name: timing["mode"] for name, timing in timings.items()} == {
+        "customers": "lookup",
+        "regions": "lookup",
+        "orders": "stream",
+    }
+    assert [timings[name]["rows"] for name in table_names] == [2, 6, 1]
+    engine.dispose()
+
+
+def test_vectorized_embedding_input_and_filters_match_row_semantics(monkeypatch):
+    plan = _orders_plan()
+    plan["business_filters"] = [
+        {"table": "orders", "column": "status", "operator": "!=", "value": "Cancelled", "source": "test"},
+        {"table": "orders", "column": "region", "operator": "==", "value": "emea", "source": "test"},
+        {"table": "orders", "column": "status", "operator": "!=", "value": "draft", "source": "test"},
+    ]
+    module = _load_script(_render_script(plan), monkeypatch)
+    frame = pd.DataFrame(
+        {
+            "title": ["Order", None, "  ", "Re-order", "Order"],
+            "note": [" late ", "refund", None, "", "gift"],
+            "status": ["open", "CANCELLED", None, "Draft", "open"],
+            "region": ["EMEA", "emea", "Emea", "emea", "apac"],
+        },
+        index=[10, 11, 12, 13, 14],
+    )
+
+    embedding_input = module._build_embedding_input(frame, ["title", "note"])
+    filtered, applied = module._apply_business_filters(frame)
+
+    assert embedding_input.tolist() == ["Order | late", "refund", "", "Re-order", "Order | gift"]
+    assert filtered.index.tolist() == [10, 12]
+    assert [item["column"] for item in applied] == ["status", "region", "status"]
+
+
+class _FakeTargetEngine:
+    def connect(self):
+        return nullcontext("target-connection")
+
+
+def test_pipeline_overlaps_stages_and_keeps_checkpoint_order(monkeypatch):
+    monkeypatch.setenv("EMBED_WORKERS", "3")
+    monkeypatch.setenv("PIPELINE_QUEUE_SIZE", "1")
+    module = _load_script(_render_script(_orders_plan()), monkeypatch)
+    loaded: list[int] = []
+
+    def _embed(chunk: int) -> int:
+        time.sleep(0.01 * (chunk % 3))
+        return chunk * 10
+
+    def _load(connection, item: int) -> None:
+        assert connection == "target-connection"
+        loaded.append(item)
+
+    stages = module._run_pipeline(iter(range(8)), _embed, _load, _FakeTargetEngine(), ordered=True)
+
+    assert loaded == [chunk * 10 for chunk in range(8)]
+    report = {name: module._stage_report(stats) for name, stats in stages.items()}
+    assert [report[name]["items"] for name in ("extract", "embed", "load")] == [8, 8, 8]
+    assert report["embed"]["workers"] == 3
+    assert report["load"]["workers"] == 1
+    assert report["embed"]["busy_seconds"] > 0
+
+
+def test_pipeline_reraises_stage_errors_without_deadlocking(monkeypatch):
+    monkeypatch.setenv("PIPELINE_QUEUE_SIZE", "1")
+    module = _load_script(_render_script(_orders_plan()), monkeypatch)
+
+    def _embed(chunk: int) -> int:
+        if chunk == 2:
+            raise ValueError("encode failed")
+        return chunk
+
+    with pytest.raises(ValueError, match="encode failed"):
+        module._run_pipeline(iter(range(50)), _embed, lambda connection, item: None, _FakeTargetEngine(), True)
+
+
+def test_embedding_process_workers_write_into_shared_buffer(monkeypatch):
+    monkeypatch.setenv("VECTOR_DIM", "3")
+    monkeypatch.setenv("EMBEDDING_PROCESSES", "4")
+    monkeypatch.setattr("os.cpu_count", lambda: 32)
+    module = _load_script(_render_script(_orders_plan()), monkeypatch)
+
+    buffer = shared_memory.SharedMemory(create=True, size=4 * 3 * 4)
+    try:
+        module._encode_into_shared_memory(["ab", "abcd"], buffer.name, 4, 2)
+        matrix = np.ndarray((4, 3), dtype=np.float32, buffer=buffer.buf).copy()
+    finally:
+        buffer.close()
+        buffer.unlink()
+
+    assert matrix.tolist() == [[0, 0, 0], [0, 0, 0], [2, 1, 0], [4, 1, 0]]
+    assert module._embedding_threads_per_process() == 8
+
+
+def test_onnx_backend_reports_cosine_drift_and_falls_back_when_too_large(monkeypatch):
+    monkeypatch.setenv("VECTOR_DIM", "2")
+    monkeypatch.setenv("EMBEDDING_BACKEND", "onnx")
+    monkeypatch.setenv("EMBEDDING_MAX_DRIFT", "0.01")
+    loaded_backends: list[str] = []
+
+    class DriftingSentenceTransformer(FakeSentenceTransformer):
+        def __init__(self, model_name: str, backend: str = "torch", **_: object) -> None:
+            super().__init__(model_name)
+            self.backend = backend
+            loaded_backends.append(backend)
+
+        def encode(self, payloads, **kwargs):
+            vectors = super().encode(payloads, **kwargs)
+            if self.backend == "onnx":
+                vectors[:, 1] += 2.0
+            return vectors
+
+    module = _load_script(_render_script(_orders_plan()), monkeypatch)
+    module.SentenceTransformer = DriftingSentenceTransformer
+    assert module._embedding_cache_model() == f"{module.EMBEDDING_MODEL}@onnx"
+
+    module._check_embedding_backend(["a", "bb", "ccc"])
+
+    assert loaded_backends == ["torch", "onnx"]
+    assert module._BACKEND_CHECK["sample_size"] == 3
+    assert module._BACKEND_CHECK["mean_cosine_drift"] > 0.01
+    assert module._BACKEND_CHECK["fell_back_to_torch"] is True
+    assert module._ACTIVE_BACKEND == "torch"
+    module._encode_batch(["dd"])
+    assert loaded_backends[-1] == "torch"
+    assert module._embedding_cache_model() == f"{module.EMBEDDING_MODEL}@torch"
+
+    module._ACTIVE_BACKEND = "onnx-int8"
+    module.EMBEDDING_ONNX_QUANTIZATION = "arm64"
+    assert module._embedding_cache_model() == f"{module.EMBEDDING_MODEL}@onnx-int8:arm64"
+
+
+class _WhitespaceTokenizer:
+    def __call__(self, text_value: str, **_: object) -> dict[str, list[tuple[int, int]]]:
+        offsets = []
+        position = 0
+        for word in text_value.split(" "):
+            offsets.append((position, position + len(word)))
+            position += len(word) + 1
+        return {"offset_mapping": offsets}
+
+
+def test_long_inputs_split_into_overlapping_chunks_sharing_source_key(monkeypatch):
+    monkeypatch.setenv("EMBEDDING_CHUNK_OVERLAP", "1")
+    module = _load_script(_render_script(_orders_plan()), monkeypatch)
+
+    class ChunkingSentenceTransformer(FakeSentenceTransformer):
+        tokenizer = _WhitespaceTokenizer()
+        max_seq_length = 6
+
+    module.SentenceTransformer = ChunkingSentenceTransformer
+    long_text = " ".join(f"w{index}" for index in range(10))
+    frame = pd.DataFrame(
+        {
+            module.SOURCE_KEY_COLUMN: [7, 7, 8],
+            "embedding_input": [long_text, "short", "tiny"],
+        },
+        index=[20, 21, 22],
+    )
+
+    rows = module._load_frame(module._split_long_inputs(frame))
+
+    assert rows["content"].tolist() == [
+        "w0 w1 w2 w3",
+        "w3 w4 w5 w6",
+        "w6 w7 w8 w9",
+        "short",
+        "tiny",
+    ]
+    assert rows["source_key"].tolist() == ["7", "7", "7", "7", "8"]
+    assert rows["source_part"].tolist() == [0, 0, 0, 1, 0]
+    assert rows["chunk_index"].tolist() == [0, 1, 2, 0, 0]
+
+
+class _SlowWhitespaceTokenizer:
+    def __call__(self, text_value: str, return_offsets_mapping: bool = False, **_: object):
+        if return_offsets_mapping:
+            raise NotImplementedError("return_offset_mapping is not available when using Python tokenizers")
+        return {"input_ids": text_value.split(" ")}
+
+
+def test_tokenizers_without_offsets_split_by_measured_chars_per_token_and_are_reported(monkeypatch):
+    monkeypatch.setenv("EMBEDDING_CHUNK_OVERLAP", "1")
+    module = _load_script(_render_script(_orders_plan()), monkeypatch)
+    long_text = " ".join(f"w{index}" for index in range(10))
+
+    chunks = module._split_text(_SlowWhitespaceTokenizer(), long_text, 4)
+
+    assert chunks == ["w0 w1 w2 w3", "w3 w4 w5 w6", "w6 w7 w8 w9"]
+    assert module._CHUNKING_STATS["estimated_inputs"] == 1
+    assert module._split_text(_SlowWhitespaceTokenizer(), "short", 4) == ["short"]
+    assert module._CHUNKING_STATS["estimated_inputs"] == 1
+
+
+def test_encode_payloads_sorts_by_length_and_restores_input_order(monkeypatch):
+    monkeypatch.setenv("VECTOR_DIM", "2")
+    module = _load_script(_render_script(_orders_plan()), monkeypatch)
+
+    embeddings = module._encode_payloads(["ccc", "a", "bbbb", "dd"])
+
+    assert FakeSentenceTransformer.encode_calls[0]["payloads"] == ["a", "dd", "ccc", "bbbb"]
+    assert embeddings[:, 0].tolist() == [3.0, 1.0, 4.0, 2.0]
+
+
+def test_vector_storage_encodes_halfvec_and_binary_quantized_payloads(monkeypatch):
+    module = _load_script(_render_script(_orders_plan()), monkeypatch)
+    embeddings = np.array([[0.5, -1.0, 2.0], [-0.25, 0.0, 1.5]], dtype=np.float32)
+
+    module._VECTOR_STORAGE = "halfvec"
+    halfvec = module._binary_vectors(embeddings)
+    assert halfvec.dtype == np.uint8 and halfvec.shape == (2, 4 + 3 * 2)
+    assert struct.unpack("!hh3e", halfvec[0].tobytes()) == (3, 0, 0.5, -1.0, 2.0)
+
+    module._VECTOR_STORAGE = "bit"
+    bits = module._binary_vectors(embeddings)
+    assert bits[0].tobytes() == struct.pack("!i", 3) + bytes([0b10100000])
+    assert bits[1].tobytes() == struct.pack("!i", 3) + bytes([0b00100000])
+    assert module._vector_literals(embeddings) == ["101", "001"]
+    assert module._vector_sql_type("bit") == "BIT(384)"
+
+
+def test_vector_storage_defaults_to_existing_column_type_and_halfvec_is_opt_in(monkeypatch):
+    monkeypatch.delenv("VECTOR_STORAGE", raising=False)
+    module = _load_script(_render_script(_orders_plan()), monkeypatch)
+    engine = create_engine("sqlite://")
+
+    with engine.connect() as connection:
+        assert module._resolve_vector_storage(connection, None) == "vector"
+        assert module._resolve_vector_storage(connection, "vector(384)") == "vector"
+        assert module._resolve_vector_storage(connection, "halfvec(384)") == "halfvec"
+
+        module.VECTOR_STORAGE = "halfvec"
+        connection.execute(text("CREATE TABLE pg_extension (extname TEXT, extversion TEXT)"))
+        connection.execute(text("INSERT INTO pg_extension VALUES ('vector', '0.8.0')"))
+        assert module._resolve_vector_storage(connection, None) == "halfvec"
+
+
+def test_pca_reduction_fits_projection_and_saves_it_for_reuse(monkeypatch, tmp_path):
+    monkeypatch.setenv("VECTOR_DIM", "2")
+    monkeypatch.setenv("EMBEDDING_REDUCTION", "pca")
+    monkeypatch.setenv("EMBEDDING_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("EMBEDDING_PROJECTION_PATH", str(tmp_path / "embedding_projection.json"))
+    rng = np.random.default_rng(3)
+    basis = rng.normal(size=(2, 6))
+
+    class WideSentenceTransformer(FakeSentenceTransformer):
+        def encode(self, payloads, **kwargs):
+            weights = np.array([[len(payload), len(payload) % 3] for payload in payloads], dtype=float)
+            return weights @ basis
+
+    script = _render_script(_orders_plan())
+    module = _load_script(script, monkeypatch)
+    module.SentenceTransformer = WideSentenceTransformer
+    payloads = ["x" * length for length in range(1, 12)]
+
+    module._fit_projection(payloads)
+    reduced = module._encode_locally(payloads)
+
+    assert module._REDUCTION_REPORT["source_dim"] == 6
+    assert module._REDUCTION_REPORT["explained_variance_ratio"] > 0.999
+    assert reduced.shape == (11, 2)
+    assert np.allclose(np.linalg.norm(reduced, axis=1), 1.0)
+    assert (tmp_path / "embedding_projection.json").exists()
+    assert module._embedding_cache_model().startswith(f"{module.EMBEDDING_MODEL}@torch#pca:")
+
+    rerun = _load_script(script, monkeypatch)
+    rerun.SentenceTransformer = WideSentenceTransformer
+    rerun._fit_projection(payloads[:1])
+    assert np.allclose(rerun._encode_locally(payloads), reduced, atol=1e-5)
+
+    # Without a cache dir the projection written for the earlier run is reused, and a resumed
+    # run with neither refuses to fit a projection of its own.
+    monkeypatch.delenv("EMBEDDING_CACHE_DIR")
+    resumed = _load_script(script, monkeypatch)
+    resumed.SentenceTransformer = WideSentenceTransformer
+    resumed._fit_projection(payloads[5:], continuing=True)
+    assert resumed._REDUCTION_REPORT["projection_source"] == "projection_path"
+    assert np.allclose(resumed._encode_locally(payloads), reduced, atol=1e-5)
+
+    monkeypatch.setenv("EMBEDDING_PROJECTION_PATH", str(tmp_path / "missing.json"))
+    orphaned = _load_script(script, monkeypatch)
+    orphaned.SentenceTransformer = WideSentenceTransformer
+    with pytest.raises(RuntimeError, match="resumed or incremental"):
+        orphaned._fit_projection(payloads[5:], continuing=True)
+
+
+def test_matryoshka_reduction_renormalizes_truncated_prefix(monkeypatch):
+    monkeypatch.setenv("VECTOR_DIM", "2")
+    monkeypatch.setenv("EMBEDDING_REDUCTION", "matryoshka")
+    module = _load_script(_render_script(_orders_plan()), monkeypatch)
+
+    reduced = module._reduce_embeddings(np.array([[3.0, 4.0, 12.0]]))
+
+    assert reduced.tolist() == [[0.6000000238418579, 0.800000011920929]]
+
+
+def _recording_engine():
+    """SQLite engine that records statements and stubs the PostgreSQL-only ones.
+
+    Transactions are real SQLAlchemy ones, so misuse such as begin() after an implicit
+    autobegin still fails here.
+    """
+    engine = create_engine("sqlite://")
+    statements: list[str] = []
+
+    @event.listens_for(engine, "connect")
+    def _register_functions(dbapi_connection, _record):
+        dbapi_connection.create_function("to_regclass", 1, lambda _name: None)
+        dbapi_connection.create_function("now", 0, lambda: "2026-01-01T00:00:00")
+
+    @event.listens_for(engine, "before_cursor_execute", retval=True)
+    def _record(_conn, _cursor, statement, parameters, _context, _executemany):
+        statements.append(" ".join(statement.split()))
+        if statement.startswith("SET LOCAL") or " USING " in statement:
+            return "SELECT 1", ()
+        return statement, parameters
+
+    return engine, statements
+
+
+def test_stale_chunks_and_source_parts_are_deleted_per_key(monkeypatch):
+    module = _load_script(_render_script(_orders_plan()), monkeypatch)
+    engine, statements = _recording_engine()
+    parameters: list[dict[str, object]] = []
+    event.listen(
+        engine,
+        "before_cursor_execute",
+        lambda _conn, _cursor, _statement, _params, context, _many: parameters.append(
+            context.compiled_parameters[0]
+        ),
+    )
+    rows = pd.DataFrame(
+        {"source_key": ["7", "7", "8"], "source_part": [0, 1, 0], "chunk_index": [0, 0, 0]}
+    )
+    # Key 7 has a third part in another load batch of the same chunk.
+    last_parts = pd.Series({"7": 2, "8": 0})
+
+    with engine.begin() as connection:
+        module._delete_stale_chunks(connection, rows, last_parts)
+
+    assert "target.chunk_index > batch.last_chunk" in statements[-2]
+    assert "target.source_part > batch.last_part" in statements[-1]
+    assert parameters[-1] == {"source_keys": ["7", "8"], "last_parts": [2, 0]}
+
+
+def test_vector_index_is_built_after_load_with_row_count_tuned_parameters(monkeypatch):
+    monkeypatch.setenv("VECTOR_INDEX", "hnsw")
+    monkeypatch.setenv("INDEX_MAINTENANCE_WORK_MEM", "2GB")
+    monkeypatch.setenv("INDEX_PARALLEL_WORKERS", "6")
+    script = _render_script(_orders_plan())
+    module = _load_script(script, monkeypatch)
+    engine, statements = _recording_engine()
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE rag_documents (id INTEGER)"))
+        connection.execute(text("INSERT INTO rag_documents VALUES (1), (2), (3)"))
+    statements.clear()
+
+    target_count, report = module._finalize_target(engine)
+
+    assert 'os.getenv("VECTOR_INDEX", "ivfflat")' in script
+    assert target_count == 3
+    assert report["params"] == {"m": 16, "ef_construction": 64}
+    assert report["seconds"] >= 0
+    assert statements[-3:] == [
+        "SET LOCAL maintenance_work_mem = '2GB'",
+        "SET LOCAL max_parallel_maintenance_workers = 6",
+        "CREATE INDEX rag_documents_embedding_hnsw_idx ON rag_documents "
+        "USING hnsw (embedding vector_cosine_ops) WITH (m = 16, ef_construction = 64)",
+    ]
+    assert module._vector_index_params("hnsw", 250_000) == {"m": 16, "ef_construction": 128}
+    assert module._vector_index_params("ivfflat", 50_000) == {"lists": 50, "recommended_probes": 7}
+    assert module._vector_index_params("ivfflat", 4_000_000)["lists"] == 2000
+    module._VECTOR_STORAGE = "bit"
+    assert module._vector_index_opclass() == "bit_hamming_ops"
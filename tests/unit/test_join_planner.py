@@ -0,0 +1,73 @@
+from ai_migration_accelerator.control_plane.join_planner import fan_out_message, plan_joins
+
+
+def _edge(from_table: str, to_table: str, from_column: str, to_column: str = "id") -> dict[str, object]:
+    return {
+        "from": from_table,
+        "to": to_table,
+        "on": {"from_columns": [from_column], "to_columns": [to_column]},
+    }
+
+
+def _profiles() -> list[dict[str, object]]:
+    return [
+        {"name": "orders", "row_count": 1_000, "primary_key": ["id"], "columns": []},
+        {"name": "customers", "row_count": 100, "primary_key": ["id"], "columns": []},
+        {
+            "name": "order_items",
+            "row_count": 50_000,
+            "primary_key": ["id"],
+            "columns": [{"name": "order_id", "num_distinct": 1_000}],
+        },
+        {
+            "name": "payments",
+            "row_count": 3_000,
+            "primary_key": ["id"],
+            "columns": [{"name": "order_id", "num_distinct": -0.5}],
+        },
+    ]
+
+
+def test_plan_orders_edges_smallest_fan_out_first_and_estimates_rows():
+    edges = [
+        _edge("orders", "customers", "customer_id"),
+        _edge("order_items", "orders", "order_id"),
+        _edge("payments", "orders", "order_id"),
+    ]
+
+    ordered, estimates = plan_joins(edges, _profiles(), max_fan_out=500)
+
+    assert [edge["from"] for edge in ordered] == ["orders", "payments", "order_items"]
+    assert [item["estimate_source"] for item in estimates["edges"]] == [
+        "primary_key",
+        "statistics",
+        "statistics",
+    ]
+    assert [item["multiplicity"] for item in estimates["edges"]] == [1.0, 2.0, 50.0]
+    assert estimates["fan_out"] == 100.0
+    assert estimates["estimated_rows"] == 100_000
+    assert estimates["status"] == "ok"
+    assert fan_out_message(estimates) is None
+
+
+def test_plan_flags_fan_out_above_limit_and_falls_back_to_samples():
+    profiles = [
+        {"name": "orders", "primary_key": ["id"], "columns": [], "sample_rows": [{"id": 1}]},
+        {"name": "customers", "columns": []},
+        {
+            "name": "order_items",
+            "columns": [],
+            "sample_rows": [{"order_id": 1}, {"order_id": 1}, {"order_id": 1}, {"order_id": 2}],
+        },
+    ]
+    edges = [_edge("orders", "customers", "customer_id"), _edge("order_items", "orders", "order_id")]
+
+    _, warned = plan_joins(edges, profiles, max_fan_out=1.5)
+    _, refused = plan_joins(edges, profiles, max_fan_out=1.5, policy="refuse")
+
+    assert [item["estimate_source"] for item in warned["edges"]] == ["foreign_key", "sample"]
+    assert warned["fan_out"] == 2.0
+    assert warned["estimated_rows"] is None
+    assert warned["status"] == "warning"
+    assert refused["status"] == "refused"
+    assert "refusing to run the migration" in fan_out_message(refused)
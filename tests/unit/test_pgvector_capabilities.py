@@ -0,0 +1,60 @@
+from ai_migration_accelerator.agents import codegen_agent
+from ai_migration_accelerator.connectors.postgres import introspection
+from ai_migration_accelerator.models.state import RunContext, WorkflowState
+
+
+def test_capabilities_follow_installed_pgvector_version():
+    legacy = introspection._capabilities_for("0.4.4")
+    hnsw_only = introspection._capabilities_for("0.6.2")
+    current = introspection._capabilities_for("0.8.0")
+
+    assert [legacy["recommended_index"], hnsw_only["recommended_index"]] == ["ivfflat", "hnsw"]
+    assert current["recommended_index"] == "hnsw" and current["supports_halfvec"]
+    assert "recommended_storage" not in current
+    assert current["supports_sparsevec"] and not hnsw_only["supports_halfvec"]
+    assert introspection._capabilities_for(None)["supports_vector"] is False
+
+
+def test_capabilities_are_cached_per_dsn_and_failures_fall_back(monkeypatch):
+    monkeypatch.setattr(introspection, "_CAPABILITY_CACHE", {})
+    probes: list[str] = []
+
+    def _fake_probe(target_connection: str) -> dict[str, object]:
+        probes.append(target_connection)
+        if "down" in target_connection:
+            raise RuntimeError("connection refused")
+        return {"probed": True, "pgvector_version": "0.7.4", **introspection._capabilities_for("0.7.4")}
+
+    monkeypatch.setattr(introspection, "_probe", _fake_probe)
+
+    first = introspection.pgvector_capabilities("postgresql+psycopg://u:p@up/db")
+    second = introspection.pgvector_capabilities("postgresql+psycopg://u:p@up/db")
+    failed = introspection.pgvector_capabilities("postgresql+psycopg://u:p@down/db")
+    introspection.pgvector_capabilities("postgresql+psycopg://u:p@down/db")
+
+    assert first == second and first["supports_halfvec"] is True
+    assert failed["probed"] is False and failed["recommended_index"] == "ivfflat"
+    assert "connection refused" in failed["probe_error"]
+    assert probes.count("postgresql+psycopg://u:p@up/db") == 1
+    assert probes.count("postgresql+psycopg://u:p@down/db") == 2
+
+
+def test_codegen_renders_probed_storage_and_index(monkeypatch):
+    monkeypatch.setattr(
+        codegen_agent,
+        "pgvector_capabilities",
+        lambda target: {"probed": True, "pgvector_version": "0.8.0", **introspection._capabilities_for("0.8.0")},
+    )
+    context = RunContext(
+        source_type="postgresql",
+        source_connection="sqlite://",
+        target_connection="postgresql+psycopg://u:p@db:5432/target",
+    )
+    state = WorkflowState(run_id="capabilities-test", context=context)
+
+    artifacts = codegen_agent.generate_code(state).generated_artifacts
+
+    assert 'os.getenv("VECTOR_INDEX", "hnsw")' in artifacts["migrate.py"]
+    # Lossy halfvec storage is never a rendered default, even when the server supports it.
+    assert 'os.getenv("VECTOR_STORAGE", "")' in artifacts["migrate.py"]
+    assert "pgvector 0.8.0 detected" in artifacts["pipeline_summary.md"]
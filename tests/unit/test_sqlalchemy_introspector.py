@@ -0,0 +1,149 @@
+from sqlalchemy import create_engine, inspect, text
+
+from ai_migration_accelerator.connectors import sqlalchemy_introspector
+
+
+def test_introspection_attaches_catalog_statistics_to_tables_and_columns(monkeypatch, tmp_path):
+    source = f"sqlite:///{tmp_path / 'source.db'}"
+    engine = create_engine(source)
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE orders (id INTEGER PRIMARY KEY, customer_id INTEGER, note TEXT)"))
+        connection.execute(text("CREATE TABLE customers (id INTEGER PRIMARY KEY)"))
+    engine.dispose()
+    # SQLite has no optimizer catalog; stand in for pg_class/pg_stats with literal rows.
+    monkeypatch.setitem(
+        sqlalchemy_introspector._TABLE_STATISTICS_QUERIES,
+        "sqlite",
+        "SELECT 'orders' AS table_name, 1000 AS row_count "
+        "UNION ALL SELECT 'customers', -1",
+    )
+    monkeypatch.setitem(
+        sqlalchemy_introspector._COLUMN_STATISTICS_QUERIES,
+        "sqlite",
+        "SELECT 'orders' AS table_name, 'customer_id' AS column_name, -0.25 AS num_distinct, "
+        "4 AS avg_width, 0.1 AS null_fraction",
+    )
+
+    metadata, error = sqlalchemy_introspector.introspect_source(
+        source_connection=source,
+        include_sample_rows=False,
+        sample_row_limit=0,
+    )
+
+    assert error is None
+    tables = {table["name"]: table for table in metadata["tables"]}
+    assert tables["orders"]["row_count"] == 1000
+    assert tables["customers"]["row_count"] is None
+    columns = {column["name"]: column for column in tables["orders"]["columns"]}
+    assert columns["customer_id"]["num_distinct"] == 250
+    assert columns["customer_id"]["avg_width"] == 4
+    assert columns["customer_id"]["null_fraction"] == 0.1
+    assert "num_distinct" not in columns["note"]
+
+
+def test_introspection_without_catalog_statistics_leaves_row_counts_unknown(tmp_path):
+    source = f"sqlite:///{tmp_path / 'source.db'}"
+    engine = create_engine(source)
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE orders (id INTEGER PRIMARY KEY, note TEXT)"))
+    engine.dispose()
+
+    metadata, error = sqlalchemy_introspector.introspect_source(source, False, 0)
+
+    assert error is None
+    assert metadata["tables"][0]["row_count"] is None
+
+
+def test_bulk_reflection_matches_per_table_inspector_calls(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'source.db'}")
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE orders (id INTEGER PRIMARY KEY, note TEXT)"))
+        connection.execute(
+            text(
+                "CREATE TABLE order_lines (order_id INTEGER NOT NULL, line_no INTEGER NOT NULL, "
+                "sku TEXT, PRIMARY KEY (order_id, line_no), "
+                "FOREIGN KEY (order_id) REFERENCES orders (id))"
+            )
+        )
+    inspector = inspect(engine)
+    table_names = inspector.get_table_names()
+
+    reflected = sqlalchemy_introspector._reflect_tables(inspector, table_names)
+
+    # A fresh inspector, so the per-table answers do not come from the bulk call's cache.
+    per_table = inspect(engine)
+    for table_name in table_names:
+        columns, primary_key, foreign_keys = reflected[table_name]
+        expected_columns = per_table.get_columns(table_name)
+        assert [{**column, "type": str(column["type"])} for column in columns] == [
+            {**column, "type": str(column["type"])} for column in expected_columns
+        ]
+        assert primary_key == per_table.get_pk_constraint(table_name)
+        assert foreign_keys == per_table.get_foreign_keys(table_name)
+    _, line_key, line_foreign_keys = reflected["order_lines"]
+    assert line_key["constrained_columns"] == ["order_id", "line_no"]
+    assert line_foreign_keys[0]["referred_table"] == "orders"
+    assert line_foreign_keys[0]["referred_columns"] == ["id"]
+    engine.dispose()
+
+
+def test_sample_query_sizes_block_sampling_by_pages():
+    # 1M rows on 10k pages: 60 wanted rows fit on one page, but at least 32 pages are sampled.
+    assert sqlalchemy_introspector._sample_query("orders", "postgresql", 3, 1_000_000, 10_000) == (
+        "SELECT * FROM orders TABLESAMPLE SYSTEM (0.3200) ORDER BY random() LIMIT 3"
+    )
+    assert sqlalchemy_introspector._sample_query("ORDERS", "oracle", 3, 1_000_000, 10_000) == (
+        "SELECT * FROM ORDERS SAMPLE BLOCK (0.3200) ORDER BY dbms_random.value FETCH FIRST 3 ROWS ONLY"
+    )
+    # Wide rows (2 per page) need 30 pages' worth of rows, still above the minimum.
+    assert sqlalchemy_introspector._sample_query("docs", "postgresql", 50, 200_000, 100_000) == (
+        "SELECT * FROM docs TABLESAMPLE SYSTEM (0.5000) ORDER BY random() LIMIT 50"
+    )
+    assert sqlalchemy_introspector._sample_query("orders", "postgresql", 3, 40, 1) == "SELECT * FROM orders LIMIT 3"
+    assert sqlalchemy_introspector._sample_query("orders", "postgresql", 3, 1_000_000, None) == (
+        "SELECT * FROM orders LIMIT 3"
+    )
+    assert sqlalchemy_introspector._sample_query("orders", "postgresql", 3, None) == "SELECT * FROM orders LIMIT 3"
+
+
+def test_short_block_sample_is_topped_up_without_duplicates(monkeypatch, tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'source.db'}")
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE orders (id INTEGER)"))
+        connection.execute(text("INSERT INTO orders VALUES (1), (2), (3), (4)"))
+
+    def _fake_sample_query(table_name, dialect_name, sample_row_limit, row_count, page_count=None):
+        if row_count is None:
+            return f"SELECT * FROM {table_name} ORDER BY id LIMIT {sample_row_limit}"
+        # Stand-in for a block sample that only hit the page holding id 2.
+        return f"SELECT * FROM {table_name} WHERE id = 2 /* SAMPLE */ LIMIT {sample_row_limit}"
+
+    monkeypatch.setattr(sqlalchemy_introspector, "_sample_query", _fake_sample_query)
+
+    rows = sqlalchemy_introspector._sample_rows(engine, "orders", "generic", 3, row_count=1000, page_count=100)
+    engine.dispose()
+
+    assert [row["id"] for row in rows] == [2, 1, 3]
+
+
+def test_sample_tables_runs_concurrently_and_isolates_failing_tables(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'source.db'}")
+    table_names = [f"t{index}" for index in range(6)]
+    with engine.begin() as connection:
+        for table_name in table_names:
+            connection.execute(text(f"CREATE TABLE {table_name} (id INTEGER)"))
+            connection.execute(text(f"INSERT INTO {table_name} VALUES (1), (2), (3)"))
+
+    samples = sqlalchemy_introspector._sample_tables(
+        engine=engine,
+        dialect_name="generic",
+        table_names=[*table_names, "missing_table"],
+        sample_row_limit=2,
+        row_counts={},
+        sample_workers=3,
+        timeout_seconds=1.0,
+    )
+    engine.dispose()
+
+    assert [len(samples[table_name]) for table_name in table_names] == [2] * 6
+    assert samples["missing_table"] == []